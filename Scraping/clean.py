@@ -1,70 +1,128 @@
 import re
 import os
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Règles compilées une seule fois (appliquées dans cet ordre par clean_line)
+RE_PARENTHESES = re.compile(r'\([^)]*\)')
+RE_CROCHETS = re.compile(r'\[.*?\]')
+# Caractères gardés : lettres (accentuées comprises), espaces, traits d'union, apostrophes
+RE_CARACTERE_GARDE = re.compile(r'[\w\s\-\'ÃÂÁÀÄÅÆÇÉÈÊËÍÌÎÏÑÓÒÔÖØÚÙÛÜÝãâáàäåæçéèêëíìîïñóòôöøúùûüýÿ]')
+RE_CHIFFRE = re.compile(r'\d')
+
+
+class TableFiltre(dict):
+    """
+    Table pour str.translate : supprime les chiffres et les caractères spéciaux.
+    Chaque caractère est classé une fois avec les mêmes expressions que les anciennes
+    règles, puis le résultat est gardé dans le dictionnaire.
+    """
+
+    def __missing__(self, code):
+        c = chr(code)
+        garde = RE_CARACTERE_GARDE.match(c) and not RE_CHIFFRE.match(c)
+        valeur = code if garde else None
+        self[code] = valeur
+        return valeur
+
+
+FILTRE = TableFiltre()
+
+
+def nettoyer_bloc(lignes, keep_empty_lines=False):
+    """Nettoyer un bloc de lignes (fonction de module : envoyée aux processus du pool)"""
+    cleaner = TextCleaner()
+    cleaned = (cleaner.clean_line(line) for line in lignes)
+    return [line for line in cleaned if line or keep_empty_lines]
+
 
 class TextCleaner:
-    def __init__(self, input_file, output_file=None):
+    def __init__(self, input_file=None, output_file=None):
+        # Sans fichier : seulement clean_line (ex. pipeline de scraping)
         self.input_file = input_file
-        self.output_file = output_file or input_file.replace('.txt', '_clean.txt')
+        self.output_file = output_file or (input_file.replace('.txt', '_clean.txt') if input_file else None)
     
     def remove_parentheses_content(self, text):
         """Enlever tout ce qui est entre parenthèses, y compris les parenthèses"""
         # Enlever le contenu entre parenthèses (incluant les parenthèses)
-        text = re.sub(r'\([^)]*\)', '', text)
+        text = RE_PARENTHESES.sub('', text)
         return text
     
     def clean_line(self, line):
         """Nettoyer une ligne complètement"""
+        # Chaque règle n'est lancée que si son caractère déclencheur est présent
         # Enlever les parenthèses et leur contenu
-        line = self.remove_parentheses_content(line)
+        if '(' in line:
+            line = self.remove_parentheses_content(line)
         
         # Enlever tout ce qui est après "/" (pour enlever les traductions arabes, etc.)
-        line = re.sub(r'/.*', '', line)
+        line = line.partition('/')[0]
         
         # Enlever les crochets et leur contenu [...]
-        line = re.sub(r'\[.*?\]', '', line)
-        
-        # Enlever les chiffres isolés ou en groupe
-        line = re.sub(r'\d+', '', line)
+        if '[' in line:
+            line = RE_CROCHETS.sub('', line)
         
-        # Enlever les caractères spéciaux mais garder les lettres accentuées
-        # Garde : lettres, espaces, traits d'union, apostrophes
-        line = re.sub(r'[^\w\s\-\'ÃÂÁÀÄÅÆÇÉÈÊËÍÌÎÏÑÓÒÔÖØÚÙÛÜÝãâáàäåæçéèêëíìîïñóòôöøúùûüýÿ]', '', line)
+        # Enlever les chiffres et les caractères spéciaux en un seul passage
+        line = line.translate(FILTRE)
         
-        # Enlever les espaces multiples
-        line = re.sub(r'\s+', ' ', line)
-        
-        # Enlever les espaces au début et à la fin
-        line = line.strip()
+        # Espaces multiples réduits à un seul, sans espace au début ni à la fin
+        return ' '.join(line.split())
+    
+    def iter_chunks(self, chunk_lines):
+        """Lignes du fichier d'entrée par blocs de chunk_lines"""
+        with open(self.input_file, 'r', encoding='utf-8') as f:
+            chunk = []
+            for line in f:
+                chunk.append(line)
+                if len(chunk) >= chunk_lines:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+    
+    def clean_chunks(self, keep_empty_lines=False, workers=1, chunk_lines=20000):
+        """
+        Blocs nettoyés dans l'ordre du fichier. Avec workers > 1, les blocs sont
+        nettoyés par un pool de processus ; au plus 2 blocs par processus sont en
+        attente pour que la mémoire reste bornée.
+        """
+        chunks = self.iter_chunks(chunk_lines)
+        if workers <= 1:
+            for chunk in chunks:
+                yield len(chunk), nettoyer_bloc(chunk, keep_empty_lines)
+            return
         
-        return line
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((len(chunk), pool.submit(nettoyer_bloc, chunk, keep_empty_lines)))
+                if len(pending) >= 2 * workers:
+                    count, future = pending.popleft()
+                    yield count, future.result()
+            while pending:
+                count, future = pending.popleft()
+                yield count, future.result()
     
-    def clean_file(self, keep_empty_lines=False):
-        """Nettoyer tout le fichier"""
+    def clean_file(self, keep_empty_lines=False, workers=1, chunk_lines=20000):
+        """Nettoyer tout le fichier (en flux, par blocs ; workers > 1 : en parallèle)"""
         try:
-            # Lire le fichier original
-            with open(self.input_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            print(f"Lecture de {len(lines)} lignes...")
+            print(f"Lecture de {self.input_file}...")
             
-            # Nettoyer chaque ligne
+            total = 0
             cleaned_lines = []
-            for line in lines:
-                cleaned = self.clean_line(line)
-                
-                # Garder la ligne si elle n'est pas vide ou si on garde les lignes vides
-                if cleaned or keep_empty_lines:
-                    cleaned_lines.append(cleaned)
-            
-            # Sauvegarder le fichier nettoyé
             with open(self.output_file, 'w', encoding='utf-8') as f:
-                for line in cleaned_lines:
-                    f.write(line + '\n')
+                for count, cleaned in self.clean_chunks(keep_empty_lines, workers, chunk_lines):
+                    total += count
+                    # Garder les lignes non vides (ou toutes si on garde les lignes vides)
+                    for line in cleaned:
+                        f.write(line + '\n')
+                    cleaned_lines.extend(cleaned)
             
             print(f"✓ Fichier nettoyé sauvegardé : {self.output_file}")
-            print(f"  - Lignes originales : {len(lines)}")
+            print(f"  - Lignes originales : {total}")
             print(f"  - Lignes nettoyées : {len(cleaned_lines)}")
-            print(f"  - Lignes supprimées : {len(lines) - len(cleaned_lines)}")
+            print(f"  - Lignes supprimées : {total - len(cleaned_lines)}")
             
             return cleaned_lines
         
@@ -118,6 +176,11 @@ class TextCleaner:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Nettoyer le dictionnaire scrapé")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Processus de nettoyage (blocs en parallèle)")
+    parser.add_argument("--chunk-lines", type=int, default=20000, help="Lignes par bloc")
+    args = parser.parse_args()
+
     # Chemin vers le fichier
     input_file = 'Dictionnaire/teny.txt'
     output_file = 'Dictionnaire/teny_clean.txt'
@@ -129,7 +192,7 @@ def main():
     cleaner = TextCleaner(input_file, output_file)
     
     # Nettoyer le fichier (ne garde pas les lignes vides)
-    cleaner.clean_file(keep_empty_lines=False)
+    cleaner.clean_file(keep_empty_lines=False, workers=args.workers, chunk_lines=args.chunk_lines)
     
     # Enlever les doublons
     print("\n🔍 Suppression des doublons...")
@@ -0,0 +1,264 @@
+import asyncio
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import httpx
+
+from scraping import (
+    ALPHABET, TENYMALAGASY_URL, USER_AGENT, WIKIPEDIA_URL,
+    allpages_url, parse_allpages, parse_range_links, parse_word_range,
+)
+
+# Réponses qui valent une nouvelle tentative (surcharge ou erreur passagère du serveur)
+STATUTS_REESSAI = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Seau à jetons : au plus `debit` requêtes par seconde en moyenne, rafales de `capacite`"""
+
+    def __init__(self, debit, capacite=None):
+        self.debit = debit
+        self.capacite = capacite or max(1.0, debit)
+        self.jetons = self.capacite
+        self.dernier = time.monotonic()
+        self.verrou = asyncio.Lock()
+
+    async def prendre(self):
+        async with self.verrou:
+            while True:
+                maintenant = time.monotonic()
+                self.jetons = min(self.capacite, self.jetons + (maintenant - self.dernier) * self.debit)
+                self.dernier = maintenant
+                if self.jetons >= 1:
+                    self.jetons -= 1
+                    return
+                await asyncio.sleep((1 - self.jetons) / self.debit)
+
+
+class CrawlerAsync:
+    """
+    Crawl concurrent des sources du dictionnaire.
+    - un client HTTP par source (connexions réutilisées) et au plus `concurrence` requêtes en vol
+    - certificat TLS vérifié pour Wikipedia ; pas pour tenymalagasy, comme le mode séquentiel
+    - un seau à jetons par hôte (`debit` requêtes/s) à la place du time.sleep fixe
+    - nouvelles tentatives avec attente exponentielle (et Retry-After) sur 429/5xx et erreurs réseau
+    - l'analyse HTML (BeautifulSoup) tourne dans un pool de processus, hors de la boucle d'événements
+    Les URLs de base sont injectables pour crawler un serveur local de pages de test.
+    Avec un EtatCrawl, les pages déjà vues sont redemandées de façon conditionnelle et
+    sautées si elles n'ont pas changé ; avec un AjoutDictionnaire, les nouveaux mots
+    sont ajoutés au fichier au fur et à mesure (reprise possible après un arrêt).
+    """
+
+    def __init__(self, wikipedia_url=WIKIPEDIA_URL, tenymalagasy_url=TENYMALAGASY_URL,
+                 concurrence=8, debit=5.0, tentatives=4, attente=0.5, timeout=10.0,
+                 verify_wikipedia=True, verify_tenymalagasy=False, workers=None, etat=None, ajout=None):
+        self.wikipedia_url = wikipedia_url
+        self.tenymalagasy_url = tenymalagasy_url
+        self.concurrence = concurrence
+        self.debit = debit
+        self.tentatives = tentatives
+        self.attente = attente
+        self.timeout = timeout
+        self.verify_wikipedia = verify_wikipedia
+        self.verify_tenymalagasy = verify_tenymalagasy
+        self.workers = workers
+        self.etat = etat
+        self.ajout = ajout
+        self.flux = None
+        # En flux : une page de rang r n'est demandée que si r < rang_attendu + fenetre,
+        # rang_attendu étant la prochaine page que le générateur doit rendre
+        self.fenetre = None
+        self.rang_attendu = 0
+        self.boucle = None
+        self.avance = None
+        self.seaux = {}
+        self.statistiques = {"requetes": 0, "reessais": 0, "echecs": 0, "inchangees": 0}
+
+    def seau(self, url):
+        hote = urlsplit(url).netloc
+        if hote not in self.seaux:
+            self.seaux[hote] = TokenBucket(self.debit)
+        return self.seaux[hote]
+
+    async def telecharger(self, client, url, entetes=None):
+        """Réponse (200 ou 304), ou None après `tentatives` échecs"""
+        for tentative in range(self.tentatives):
+            await self.seau(url).prendre()
+            async with self.limite:
+                self.statistiques["requetes"] += 1
+                try:
+                    response = await client.get(url, headers=entetes)
+                except httpx.TransportError as e:
+                    erreur, retry_after = e, None
+                else:
+                    if response.status_code == 304:
+                        return response
+                    if response.status_code not in STATUTS_REESSAI:
+                        try:
+                            response.raise_for_status()
+                        except httpx.HTTPStatusError as e:
+                            print(f"    ❌ {url} : {e}")
+                            self.statistiques["echecs"] += 1
+                            return None
+                        return response
+                    erreur = f"HTTP {response.status_code}"
+                    retry_after = response.headers.get("Retry-After")
+
+            if tentative + 1 < self.tentatives:
+                self.statistiques["reessais"] += 1
+                delai = self.attente * 2 ** tentative * (1 + random.random())
+                if retry_after and retry_after.isdigit():
+                    delai = max(delai, float(retry_after))
+                await asyncio.sleep(delai)
+
+        print(f"    ❌ {url} : {erreur} ({self.tentatives} tentatives)")
+        self.statistiques["echecs"] += 1
+        return None
+
+    async def analyser(self, fonction, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executeur, fonction, *args)
+
+    async def page(self, client, url, fonction, *args, conserver=False, rang=None):
+        """
+        En flux (iter_words), chaque page de mots est passée au générateur avec son
+        rang, même vide, et n'est pas gardée en mémoire. Elle n'est demandée qu'une
+        fois dans la fenêtre des rangs attendus : une page en retard (réessais) ne
+        laisse pas s'accumuler plus de `fenetre` pages en avance.
+        """
+        en_flux = self.flux is not None and not conserver
+        if en_flux:
+            await self.attendre_fenetre(rang)
+        resultat = await self.charger_page(client, url, fonction, *args, conserver=conserver)
+        if en_flux:
+            # File bornée : put() bloque quand le consommateur est en retard, hors de la boucle
+            await asyncio.get_running_loop().run_in_executor(None, self.flux.put, (rang, resultat))
+            return []
+        return resultat
+
+    async def attendre_fenetre(self, rang):
+        while rang >= self.rang_attendu + self.fenetre:
+            await self.avance.wait()
+
+    def avancer(self):
+        """Appelé dans la boucle quand le générateur a rendu une page : réveiller les pages en attente"""
+        self.avance.set()
+        self.avance = asyncio.Event()
+
+    async def charger_page(self, client, url, fonction, *args, conserver=False):
+        """
+        Résultat de l'analyse de la page. Une page de mots est ajoutée au dictionnaire
+        avant d'être marquée terminée ; une page inchangée renvoie [] (ses mots sont
+        déjà dans le fichier), ou le résultat conservé dans l'état si conserver=True.
+        """
+        etat = self.etat
+        response = await self.telecharger(client, url, etat.entetes(url) if etat else None)
+        if response is None:
+            return []
+        if etat is not None and (response.status_code == 304 or etat.inchangee(url, response.content)):
+            self.statistiques["inchangees"] += 1
+            etat.marquer(url, response.headers)
+            return etat.resultat(url) if conserver else []
+
+        resultat = await self.analyser(fonction, response.content, *args)
+        if self.ajout is not None and not conserver:
+            self.ajout.ajouter(resultat)
+        if etat is not None:
+            etat.marquer(url, response.headers, response.content, resultat if conserver else None)
+        return resultat
+
+    async def wikipedia(self, client):
+        print("Scraping Wikipedia malgache (tous les articles)...")
+        pages = await asyncio.gather(*(
+            self.page(client, allpages_url(self.wikipedia_url, letter), parse_allpages, rang=i)
+            for i, letter in enumerate(ALPHABET)
+        ))
+        # Résultats dans l'ordre alphabétique, quel que soit l'ordre d'arrivée
+        return [mot for mots in pages for mot in mots]
+
+    async def tenymalagasy(self, client):
+        print("Scraping Motmalgache (toutes les plages)...")
+        plages = await self.page(client, self.tenymalagasy_url, parse_range_links, self.tenymalagasy_url,
+                                 conserver=True)
+        print(f"  ✓ Trouvé {len(plages)} plages de mots à scraper")
+        pages = await asyncio.gather(*(
+            self.page(client, url, parse_word_range, rang=len(ALPHABET) + i) for i, url in enumerate(plages)
+        ))
+        return [mot for mots in pages for mot in mots]
+
+    async def crawler(self):
+        """(mots Wikipedia, mots Motmalgache)"""
+        self.limite = asyncio.Semaphore(self.concurrence)
+        self.avance = asyncio.Event()
+        self.boucle = asyncio.get_running_loop()
+        limites = httpx.Limits(max_connections=self.concurrence, max_keepalive_connections=self.concurrence)
+
+        def client(verify):
+            return httpx.AsyncClient(headers={'User-Agent': USER_AGENT}, limits=limites, timeout=self.timeout,
+                                     verify=verify, follow_redirects=True)
+
+        with ProcessPoolExecutor(self.workers) as self.executeur:
+            async with client(self.verify_wikipedia) as wikipedia, client(self.verify_tenymalagasy) as teny:
+                return await asyncio.gather(self.wikipedia(wikipedia), self.tenymalagasy(teny))
+
+    def executer(self):
+        debut = time.perf_counter()
+        wiki_words, teny_words = asyncio.run(self.crawler())
+        print(f"✓ Crawl terminé en {time.perf_counter() - debut:.1f}s "
+              f"({self.statistiques['requetes']} requêtes, {self.statistiques['reessais']} réessais, "
+              f"{self.statistiques['echecs']} échecs, {self.statistiques['inchangees']} pages inchangées)")
+        return wiki_words, teny_words
+
+    def iter_words(self, taille_file=64):
+        """
+        Mots crawlés au fil de l'eau (générateur synchrone), dans le même ordre que
+        executer(). Le crawl tourne dans un thread ; la file bornée le ralentit si le
+        consommateur est plus lent. Les pages arrivées en avance attendent leur tour :
+        au plus taille_file pages sont en mémoire (file et pages en avance comprises).
+        """
+        self.flux = queue.Queue(taille_file)
+        self.fenetre = taille_file
+        self.rang_attendu = 0
+        fin = object()
+        erreurs = []
+
+        def crawl():
+            try:
+                self.executer()
+            except BaseException as e:
+                erreurs.append(e)
+            finally:
+                self.flux.put(fin)
+
+        thread = threading.Thread(target=crawl, daemon=True)
+        thread.start()
+        attendu = 0
+        en_avance = {}
+        while True:
+            element = self.flux.get()
+            if element is fin:
+                break
+            rang, words = element
+            en_avance[rang] = words
+            if attendu not in en_avance:
+                continue
+            while attendu in en_avance:
+                yield from en_avance.pop(attendu)
+                attendu += 1
+            self.rang_attendu = attendu
+            try:
+                self.boucle.call_soon_threadsafe(self.avancer)
+            except RuntimeError:
+                # Boucle déjà fermée : le crawl est terminé
+                pass
+        # Trou dans les rangs (ex. page des plages en échec) : le reste dans l'ordre
+        for rang in sorted(en_avance):
+            yield from en_avance[rang]
+        thread.join()
+        self.flux = None
+        self.fenetre = None
+        if erreurs:
+            raise erreurs[0]
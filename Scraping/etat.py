@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import time
+
+
+def empreinte(contenu):
+    return hashlib.sha1(contenu).hexdigest()
+
+
+class EtatCrawl:
+    """
+    État persistant du crawl (JSON), enregistré après chaque page terminée.
+    Pour chaque URL : ETag / Last-Modified (requêtes conditionnelles), empreinte
+    du contenu et date. Une page n'est enregistrée qu'une fois ses mots ajoutés
+    au dictionnaire : après un arrêt brutal, la reprise saute les pages terminées.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                donnees = json.load(f)
+            if donnees.get('version') == self.VERSION:
+                self.pages = donnees.get('pages', {})
+
+    def entetes(self, url):
+        """En-têtes conditionnels pour une page déjà vue"""
+        page = self.pages.get(url)
+        if page is None:
+            return {}
+        entetes = {}
+        if page.get('etag'):
+            entetes['If-None-Match'] = page['etag']
+        if page.get('last_modified'):
+            entetes['If-Modified-Since'] = page['last_modified']
+        return entetes
+
+    def inchangee(self, url, contenu):
+        """Même contenu que la dernière fois (serveur sans ETag ni Last-Modified)"""
+        page = self.pages.get(url)
+        return page is not None and page.get('hash') == empreinte(contenu)
+
+    def resultat(self, url):
+        return self.pages.get(url, {}).get('resultat', [])
+
+    def marquer(self, url, headers, contenu=None, resultat=None):
+        """Page terminée ; contenu None pour une réponse 304 (l'empreinte est conservée)"""
+        page = self.pages.setdefault(url, {})
+        if headers.get('ETag'):
+            page['etag'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            page['last_modified'] = headers['Last-Modified']
+        if contenu is not None:
+            page['hash'] = empreinte(contenu)
+        if resultat is not None:
+            page['resultat'] = resultat
+        page['date'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.sauvegarder()
+
+    def sauvegarder(self):
+        # Écriture atomique : l'état n'est jamais à moitié écrit
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'pages': self.pages}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+class AjoutDictionnaire:
+    """Ajout en fin de fichier des seuls mots absents du dictionnaire (comparaison sans casse)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connus = set()
+        # Fichier existant sans saut de ligne final : le premier ajout le complète
+        self.saut = False
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for ligne in f:
+                    if ligne.strip():
+                        self.connus.add(ligne.strip().lower())
+                    self.saut = not ligne.endswith('\n')
+        self.nouveaux = 0
+
+    def ajouter(self, words):
+        """Écrire les nouveaux mots ({'mot': ...}) ; renvoie leur nombre"""
+        lignes = []
+        for word in words:
+            cle = word['mot'].lower()
+            if cle not in self.connus:
+                self.connus.add(cle)
+                lignes.append(word['mot'] + '\n')
+        if lignes:
+            if self.saut:
+                lignes[0] = '\n' + lignes[0]
+                self.saut = False
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(lignes)
+                f.flush()
+                os.fsync(f.fileno())
+        self.nouveaux += len(lignes)
+        return len(lignes)
@@ -0,0 +1,76 @@
+import hashlib
+import os
+from contextlib import ExitStack, contextmanager
+
+from clean import TextCleaner
+
+
+def cle_mot(mot):
+    """Empreinte 64 bits du mot sans casse : la mémoire du dédoublonnage ne dépend pas de la longueur des mots"""
+    return int.from_bytes(hashlib.blake2b(mot.casefold().encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def dedupliquer(mots):
+    """Première occurrence de chaque mot (comparaison sans casse), au fil de l'eau"""
+    vus = set()
+    for mot in mots:
+        cle = cle_mot(mot)
+        if cle not in vus:
+            vus.add(cle)
+            yield mot
+
+
+def nettoyer(mots, cleaner=None):
+    """Mots passés par TextCleaner.clean_line, les lignes vides en moins"""
+    cleaner = cleaner or TextCleaner()
+    for mot in mots:
+        ligne = cleaner.clean_line(mot)
+        if ligne:
+            yield ligne
+
+
+@contextmanager
+def fichier_atomique(path):
+    """Fichier écrit à côté puis renommé : jamais de sortie à moitié écrite en cas d'erreur"""
+    tmp = path + '.tmp'
+    f = open(tmp, 'w', encoding='utf-8')
+    try:
+        yield f
+        f.close()
+        os.replace(tmp, path)
+    except BaseException:
+        f.close()
+        os.remove(tmp)
+        raise
+
+
+def copier(mots, f):
+    """Écrire chaque mot dans f en le laissant passer (copie brute au passage)"""
+    for mot in mots:
+        f.write(mot + '\n')
+        yield mot
+
+
+def executer(words, sortie_propre, sortie_brute=None):
+    """
+    scraper -> dédoublonnage -> [copie brute] -> clean_line -> dédoublonnage -> fichier propre.
+    Un seul passage, sans liste intermédiaire : la mémoire se limite aux empreintes
+    des mots déjà vus. Renvoie (mots bruts uniques, mots propres uniques).
+    """
+    compteurs = {'bruts': 0, 'propres': 0}
+
+    def compter(mots):
+        for mot in mots:
+            compteurs['bruts'] += 1
+            yield mot
+
+    with ExitStack() as fichiers:
+        propre = fichiers.enter_context(fichier_atomique(sortie_propre))
+        mots = dedupliquer(word['mot'] for word in words)
+        if sortie_brute:
+            mots = copier(mots, fichiers.enter_context(fichier_atomique(sortie_brute)))
+
+        for ligne in dedupliquer(nettoyer(compter(mots))):
+            propre.write(ligne + '\n')
+            compteurs['propres'] += 1
+    return compteurs['bruts'], compteurs['propres']
@@ -1,22 +1,126 @@
+import argparse
 import requests
 from bs4 import BeautifulSoup
 import json
 import csv
+import itertools
 import time
 import os
 import warnings
-from urllib.parse import urljoin
+from urllib.parse import quote, urljoin
 
 # Désactiver les warnings SSL
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 from urllib3.exceptions import InsecureRequestWarning
 warnings.filterwarnings('ignore', category=InsecureRequestWarning)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+WIKIPEDIA_URL = "https://mg.wikipedia.org"
+TENYMALAGASY_URL = "https://motmalgache.org/bins/alphaLists"
+# Lettres utilisées en malgache (index alphabétique de Wikipedia)
+ALPHABET = 'ABDEFGHIJKLMNOPRSTV'
+
+
+# Analyse des pages (sans réseau) : partagée par le mode séquentiel et le crawler asynchrone
+
+def allpages_url(base_url, letter):
+    """URL de la liste des pages Wikipedia commençant par cette lettre"""
+    return f"{base_url}/w/index.php?title=Manokana:Pejy_rehetra&from={letter}"
+
+
+def parse_allpages(html):
+    """Titres d'articles d'une page Manokana:Pejy_rehetra"""
+    soup = BeautifulSoup(html, 'html.parser')
+    words = []
+    # Trouver tous les liens d'articles
+    content = soup.find('div', {'class': 'mw-allpages-body'})
+    if not content:
+        content = soup.find('div', {'id': 'mw-content-text'})
+
+    if content:
+        for link in content.find_all('a'):
+            title = link.get_text().strip()
+            # Filtrer les liens spéciaux et garder seulement les articles
+            if title and not title.startswith(('Manokana:', 'Wikipedia:', 'Fichier:', 'Special:')):
+                if len(title) > 1:
+                    words.append({
+                        'mot': title,
+                        'source': 'wikipedia_mg'
+                    })
+    return words
+
+
+def article_url(base_url, title):
+    """URL d'un article Wikipedia à partir de son titre"""
+    return f"{base_url}/wiki/{quote(title.replace(' ', '_'))}"
+
+
+def parse_paragraphes(html):
+    """Texte des paragraphes du contenu principal d'un article (corpus des fréquences)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    content = soup.find('div', {'id': 'mw-content-text'})
+    if not content:
+        return []
+    paragraphes = []
+    for para in content.find_all('p'):
+        # Un paragraphe par ligne dans le corpus
+        text = ' '.join(para.get_text().split())
+        if text:
+            paragraphes.append(text)
+    return paragraphes
+
+
+def parse_range_links(html, url):
+    """URLs des plages de mots (paramètre range) de la page principale, sans doublons"""
+    soup = BeautifulSoup(html, 'html.parser')
+    all_ranges = []
+    seen_ranges = set()
+
+    # Trouver tous les liens avec les plages (range parameter)
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '')
+        if 'range=' in href and 'lang=mg' in href:
+            full_url = urljoin(url, href)
+            # Extraire juste le paramètre range pour éviter les doublons
+            range_param = href.split('range=')[1]
+            if range_param and range_param not in seen_ranges:
+                seen_ranges.add(range_param)
+                all_ranges.append(full_url)
+    return all_ranges
+
+
+def parse_word_range(html):
+    """Mots du tableau d'une plage"""
+    soup = BeautifulSoup(html, 'html.parser')
+    words = []
+    seen = set()  # Pour éviter les doublons dans la même page
+
+    # Extraire tous les mots du tableau
+    for row in soup.find_all('tr'):
+        # Chercher dans toutes les cellules
+        for cell in row.find_all('td'):
+            # Extraire le texte des liens
+            for link in cell.find_all('a'):
+                text = link.get_text().strip()
+                # Ne garder que les mots (pas les balises HTML vides)
+                if text and len(text) > 0 and text not in seen and text != '-':
+                    seen.add(text)
+                    words.append({
+                        'mot': text,
+                        'source': 'tenymalagasy'
+                    })
+    return words
+
+
 class MalagasyScraper:
-    def __init__(self):
+    def __init__(self, wikipedia_url=WIKIPEDIA_URL, tenymalagasy_url=TENYMALAGASY_URL, delay=0.5):
+        # URLs de base injectables (ex. serveur local de pages de test)
+        self.wikipedia_url = wikipedia_url
+        self.tenymalagasy_url = tenymalagasy_url
+        self.delay = delay
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': USER_AGENT
         })
     
     def scrape_wikipedia_mg(self, url):
@@ -42,8 +146,7 @@ class MalagasyScraper:
                         })
                 
                 # Extraire aussi le texte des paragraphes
-                for para in content.find_all('p'):
-                    text = para.get_text().strip()
+                for text in parse_paragraphes(response.content):
                     if text:
                         # Diviser en mots
                         mots_texte = text.split()
@@ -62,122 +165,84 @@ class MalagasyScraper:
             print(f"Erreur Wikipedia: {e}")
             return []
     
-    def scrape_all_wikipedia_articles(self):
-        """Scrape tous les articles de Wikipedia malgache par catégories alphabétiques"""
-        base_url = "https://mg.wikipedia.org"
-        all_words = []
-        
+    def iter_wikipedia_articles(self):
+        """Mots de Wikipedia malgache, page par page (générateur)"""
         print("Scraping Wikipedia malgache (tous les articles)...")
-        
-        # Liste des lettres pour récupérer toutes les pages
-        # Wikipedia organise souvent par index alphabétique
-        alphabet = 'ABDEFGHIJKLMNOPRSTV'  # Lettres utilisées en malgache
-        
-        for letter in alphabet:
+        total = 0
+
+        for letter in ALPHABET:
             try:
                 # URL pour la liste des pages commençant par cette lettre
-                url = f"{base_url}/w/index.php?title=Manokana:Pejy_rehetra&from={letter}"
+                url = allpages_url(self.wikipedia_url, letter)
                 print(f"  Scraping pages commençant par '{letter}'...")
-                
+
                 response = self.session.get(url, timeout=10)
                 response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Trouver tous les liens d'articles
-                content = soup.find('div', {'class': 'mw-allpages-body'})
-                if not content:
-                    content = soup.find('div', {'id': 'mw-content-text'})
-                
-                if content:
-                    for link in content.find_all('a'):
-                        title = link.get_text().strip()
-                        # Filtrer les liens spéciaux et garder seulement les articles
-                        if title and not title.startswith(('Manokana:', 'Wikipedia:', 'Fichier:', 'Special:')):
-                            if len(title) > 1:
-                                all_words.append({
-                                    'mot': title,
-                                    'source': 'wikipedia_mg'
-                                })
-                
-                print(f"    → {len(all_words)} mots au total")
-                time.sleep(0.5)
-                
+                words = parse_allpages(response.content)
+                total += len(words)
+
+                print(f"    → {total} mots au total")
+                yield from words
+                time.sleep(self.delay)
+
             except Exception as e:
                 print(f"    ❌ Erreur pour '{letter}': {e}")
-        
-        return all_words
-    
-    def scrape_tenymalagasy(self, url):
-        """Scrape le site tenymalagasy.org"""
+
+    def scrape_all_wikipedia_articles(self):
+        """Scrape tous les articles de Wikipedia malgache par catégories alphabétiques"""
+        return list(self.iter_wikipedia_articles())
+
+    def iter_paragraphes(self, titres, max_articles=None):
+        """Paragraphes des articles Wikipedia de ces titres (générateur)"""
+        for i, titre in enumerate(itertools.islice(titres, max_articles), 1):
+            url = article_url(self.wikipedia_url, titre)
+            try:
+                response = self.session.get(url, timeout=10)
+                response.raise_for_status()
+                yield from parse_paragraphes(response.content)
+            except Exception as e:
+                print(f"    ❌ Erreur pour '{titre}': {e}")
+            if i % 100 == 0:
+                print(f"    → {i} articles")
+            time.sleep(self.delay)
+
+    def iter_tenymalagasy(self, url=None):
+        """Mots de tenymalagasy.org, plage par plage (générateur)"""
+        url = url or self.tenymalagasy_url
         try:
             print("  Chargement de la page principale...")
             response = self.session.get(url, timeout=10, verify=False)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            words = []
-            all_ranges = []
-            seen_ranges = set()
-            
-            # Trouver tous les liens avec les plages (range parameter)
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                if 'range=' in href and 'lang=mg' in href:
-                    full_url = urljoin(url, href)
-                    # Extraire juste le paramètre range pour éviter les doublons
-                    range_param = href.split('range=')[1] if 'range=' in href else ''
-                    if range_param and range_param not in seen_ranges:
-                        seen_ranges.add(range_param)
-                        all_ranges.append(full_url)
-            
-            print(f"  ✓ Trouvé {len(all_ranges)} plages de mots à scraper\n")
-            
-            # Scraper chaque plage
-            for i, range_url in enumerate(all_ranges, 1):
-                range_name = range_url.split('range=')[1] if 'range=' in range_url else 'unknown'
-                print(f"  [{i}/{len(all_ranges)}] Plage: {range_name}")
-                range_words = self.scrape_word_range(range_url)
-                words.extend(range_words)
-                time.sleep(0.5)  # Pause réduite à 0.5s
-            
-            return words
-        
+            all_ranges = parse_range_links(response.content, url)
         except Exception as e:
             print(f"❌ Erreur Tenymalagasy: {e}")
-            return []
-    
+            return
+        print(f"  ✓ Trouvé {len(all_ranges)} plages de mots à scraper\n")
+
+        # Scraper chaque plage
+        for i, range_url in enumerate(all_ranges, 1):
+            range_name = range_url.split('range=')[1] if 'range=' in range_url else 'unknown'
+            print(f"  [{i}/{len(all_ranges)}] Plage: {range_name}")
+            yield from self.scrape_word_range(range_url)
+            time.sleep(self.delay)
+
+    def scrape_tenymalagasy(self, url=None):
+        """Scrape le site tenymalagasy.org"""
+        return list(self.iter_tenymalagasy(url))
+
     def scrape_word_range(self, url):
         """Scrape une plage spécifique de mots"""
         try:
             response = self.session.get(url, timeout=10, verify=False)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            words = []
-            seen = set()  # Pour éviter les doublons dans la même page
-            
-            # Extraire tous les mots du tableau
-            for row in soup.find_all('tr'):
-                # Chercher dans toutes les cellules
-                for cell in row.find_all('td'):
-                    # Extraire le texte des liens
-                    for link in cell.find_all('a'):
-                        text = link.get_text().strip()
-                        # Ne garder que les mots (pas les balises HTML vides)
-                        if text and len(text) > 0 and text not in seen and text != '-':
-                            seen.add(text)
-                            words.append({
-                                'mot': text,
-                                'source': 'tenymalagasy'
-                            })
-            
+            words = parse_word_range(response.content)
             print(f"    → {len(words)} mots extraits")
             return words
-        
+
         except Exception as e:
             print(f"    ❌ Erreur: {e}")
             return []
-    
+
     def scrape_word_list_from_letter(self, base_url, letter):
         """Scrape une liste de mots pour une lettre spécifique"""
         try:
@@ -242,24 +307,87 @@ class MalagasyScraper:
 
 
 def main():
-    scraper = MalagasyScraper()
+    parser = argparse.ArgumentParser(description="Construire Dictionnaire/teny.txt depuis Wikipedia et Motmalgache")
+    parser.add_argument("--async", dest="asynchrone", action="store_true",
+                        help="Crawl concurrent (httpx) au lieu du mode séquentiel")
+    parser.add_argument("--concurrence", type=int, default=8, help="Requêtes simultanées (mode --async)")
+    parser.add_argument("--debit", type=float, default=5.0, help="Requêtes par seconde et par hôte (mode --async)")
+    parser.add_argument("--wikipedia-url", default=WIKIPEDIA_URL)
+    parser.add_argument("--tenymalagasy-url", default=TENYMALAGASY_URL)
+    parser.add_argument("--sortie", default='Dictionnaire/teny.txt')
+    parser.add_argument("--etat", help="État du crawl (JSON) : reprise, pages inchangées sautées et "
+                                       "ajout des seuls nouveaux mots à --sortie (implique --async)")
+    parser.add_argument("--propre", help="Pipeline en flux : mots nettoyés (clean_line) et dédoublonnés "
+                                         "écrits dans ce fichier, copie brute dans --sortie")
+    parser.add_argument("--corpus", help="Écrire le texte des paragraphes des articles Wikipedia dans ce "
+                                         "fichier (un paragraphe par ligne) pour la table de fréquences "
+                                         "(python -m module_IA.frequences)")
+    parser.add_argument("--max-articles", type=int, help="Nombre d'articles lus pour --corpus")
+    args = parser.parse_args()
+
+    scraper = MalagasyScraper(args.wikipedia_url, args.tenymalagasy_url)
     
-    # Créer le dossier Dictionnaire s'il n'existe pas
-    os.makedirs('Dictionnaire', exist_ok=True)
+    # Créer le dossier de sortie s'il n'existe pas
+    os.makedirs(os.path.dirname(args.sortie) or '.', exist_ok=True)
     
     all_words = []
     
-    # Scraper Wikipedia (TOUS les articles)
-    print("="*60)
-    wiki_words = scraper.scrape_all_wikipedia_articles()
+    if args.corpus:
+        import pipeline
+        print("="*60)
+        titres = (word['mot'] for word in scraper.iter_wikipedia_articles())
+        paragraphes = 0
+        with pipeline.fichier_atomique(args.corpus) as f:
+            for paragraphe in scraper.iter_paragraphes(titres, args.max_articles):
+                f.write(paragraphe + '\n')
+                paragraphes += 1
+        print(f"✅ TERMINÉ ! {paragraphes} paragraphes écrits dans {args.corpus}")
+        return
+
+    if args.etat:
+        from crawler import CrawlerAsync
+        from etat import AjoutDictionnaire, EtatCrawl
+        print("="*60)
+        ajout = AjoutDictionnaire(args.sortie)
+        crawler = CrawlerAsync(args.wikipedia_url, args.tenymalagasy_url,
+                               concurrence=args.concurrence, debit=args.debit,
+                               etat=EtatCrawl(args.etat), ajout=ajout)
+        crawler.executer()
+        print(f"✅ TERMINÉ ! {ajout.nouveaux} nouveaux mots ajoutés à {args.sortie} "
+              f"({len(ajout.connus)} mots au total)")
+        return
+
+    if args.propre:
+        import pipeline
+        print("="*60)
+        if args.asynchrone:
+            from crawler import CrawlerAsync
+            words = CrawlerAsync(args.wikipedia_url, args.tenymalagasy_url,
+                                 concurrence=args.concurrence, debit=args.debit).iter_words()
+        else:
+            words = itertools.chain(scraper.iter_wikipedia_articles(), scraper.iter_tenymalagasy())
+        bruts, propres = pipeline.executer(words, args.propre, args.sortie)
+        print(f"✅ TERMINÉ ! {bruts} mots uniques dans {args.sortie}, {propres} mots nettoyés dans {args.propre}")
+        return
+
+    if args.asynchrone:
+        from crawler import CrawlerAsync
+        print("="*60)
+        crawler = CrawlerAsync(args.wikipedia_url, args.tenymalagasy_url,
+                               concurrence=args.concurrence, debit=args.debit)
+        wiki_words, teny_words = crawler.executer()
+    else:
+        # Scraper Wikipedia (TOUS les articles)
+        print("="*60)
+        wiki_words = scraper.scrape_all_wikipedia_articles()
+
+        # Scraper Tenymalagasy (toutes les plages)
+        print("="*60)
+        print("Scraping Motmalgache (toutes les plages)...")
+        teny_words = scraper.scrape_tenymalagasy()
+
     all_words.extend(wiki_words)
     print(f"✓ Total Wikipedia: {len(wiki_words)} mots\n")
-    
-    # Scraper Tenymalagasy (toutes les plages)
-    print("="*60)
-    print("Scraping Motmalgache (toutes les plages)...")
-    tenymalagasy_url = "https://motmalgache.org/bins/alphaLists"
-    teny_words = scraper.scrape_tenymalagasy(tenymalagasy_url)
     all_words.extend(teny_words)
     print(f"\n✓ Total Motmalgache: {len(teny_words)} mots")
     
@@ -272,7 +400,7 @@ def main():
     # Sauvegarder dans le dossier Dictionnaire
     print("\n" + "="*60)
     print("Sauvegarde des fichiers...")
-    scraper.save_to_txt(all_words, 'Dictionnaire/teny.txt')
+    scraper.save_to_txt(all_words, args.sortie)
     #scraper.save_to_json(all_words, 'Dictionnaire/mots_malgaches.json')
     #scraper.save_to_csv(all_words, 'Dictionnaire/mots_malgaches.csv')
     
@@ -283,7 +411,7 @@ def main():
         print(f"  • {word['mot']} (source: {word['source']})")
     
     print("\n" + "="*60)
-    print(f"✅ TERMINÉ ! {len(all_words)} mots sauvegardés dans Dictionnaire/")
+    print(f"✅ TERMINÉ ! {len(all_words)} mots sauvegardés dans {args.sortie}")
     print("="*60)
 
 
@@ -1,11 +1,214 @@
-from typing import Union
-from fastapi import FastAPI
+from typing import List, Union
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, model_validator
+import asyncio
+import json
+import re
+import os
+import threading
+import time
+import uuid
 
 #Importer les Modules IA
-from module_IA import levenshtein
+from module_IA import metriques
+from module_IA.dictionnaire import Dictionnaire
+from module_IA.execution import PoolCorrection, Service
+from module_IA.incremental import ParagrapheInconnu, VerificateurIncremental, appliquer_edition
+from module_IA.rechargement import Rechargeur
+from module_IA.verificationmot import MalagasySpellChecker
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), "Dictionnaire/teny_clean.txt")
+# Dictionnaire binaire projeté en mémoire et partagé entre les workers, utilisé s'il existe
+# et n'est pas plus ancien que le fichier texte
+# (python -m module_IA.dicobin Dictionnaire/teny_clean.txt Dictionnaire/teny_clean.bin --bktree)
+DICTIONARY_BIN_PATH = os.path.join(os.path.dirname(__file__), "Dictionnaire/teny_clean.bin")
+# Arbre BK pré-calculé (python -m module_IA.bktree Dictionnaire/teny_clean.txt Dictionnaire/teny_clean.bktree)
+BKTREE_PATH = os.path.join(os.path.dirname(__file__), "Dictionnaire/teny_clean.bktree")
+# Fréquences des mots dans le corpus Wikipedia, utilisées si la table existe
+# (python -m module_IA.frequences Dictionnaire/teny_clean.txt corpus.txt -o Dictionnaire/teny_clean.freq)
+FREQUENCES_PATH = os.path.join(os.path.dirname(__file__), "Dictionnaire/teny_clean.freq")
+# Avec une table de fréquences : mots vus moins de FREQUENCE_MIN fois écartés des suggestions
+FREQUENCE_MIN = int(os.environ.get("FREQUENCE_MIN", "0"))
+# Moteur du mot proche : levenshtein (parcours linéaire), bktree, symspell, numpy ou automate
+MOTEUR_CORRECTION = os.environ.get("MOTEUR_CORRECTION", "bktree")
+# Nombre de mots proches mémorisés (0 pour désactiver le cache)
+TAILLE_CACHE = int(os.environ.get("TAILLE_CACHE", "10000"))
+# Nombre de processus pour le calcul du mot proche (0 : calcul dans le processus de l'API)
+CORRECTION_WORKERS = int(os.environ.get("CORRECTION_WORKERS", "0"))
+# Jeton du profileur : une requête avec l'en-tête "X-Profile: <jeton>" est profilée
+# (désactivé si vide). Le profil est lu sur /metrics/profiles/{id} (en-tête X-Profile-Id).
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+# Jeton des endpoints d'administration (en-tête "X-Admin-Token"), désactivés si vide
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+# Rechargement automatique quand un fichier du dictionnaire change (1 pour activer).
+# Chaque processus uvicorn recharge le sien : avec --workers, préférer ce mode à /admin/reload.
+RECHARGEMENT_AUTO = os.environ.get("RECHARGEMENT_AUTO", "0") == "1"
+# Sans watchfiles, période du relevé des dates de modification (secondes)
+RECHARGEMENT_INTERVALLE = float(os.environ.get("RECHARGEMENT_INTERVALLE", "2"))
+
+
+def chemin_dictionnaire():
+    """
+    Le dictionnaire binaire s'il existe et n'est pas plus ancien que le fichier texte :
+    sinon le texte a été modifié depuis la construction du .bin, qui est ignoré.
+    """
+    try:
+        date_bin = os.stat(DICTIONARY_BIN_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return DICTIONARY_PATH
+    try:
+        date_texte = os.stat(DICTIONARY_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return DICTIONARY_BIN_PATH
+    if date_bin < date_texte:
+        print(f"ℹ️  {os.path.basename(DICTIONARY_BIN_PATH)} plus ancien que {os.path.basename(DICTIONARY_PATH)} : "
+              f"dictionnaire texte utilisé (reconstruire avec python -m module_IA.dicobin)")
+        return DICTIONARY_PATH
+    return DICTIONARY_BIN_PATH
+
+
+def charger_dictionnaire():
+    path = chemin_dictionnaire()
+    return Dictionnaire.charger(
+        path, BKTREE_PATH, MOTEUR_CORRECTION, TAILLE_CACHE, FREQUENCES_PATH, FREQUENCE_MIN
+    )
+
+
+def installer_dictionnaire(nouveau):
+    """
+    Bascule vers un dictionnaire reconstruit (thread du Rechargeur). Le nouveau pool est
+    démarré avant la bascule, puis dictionnaire et pool sont remplacés ensemble. L'ancien
+    pool n'accepte plus de calcul (les requêtes qui le trouvent fermé calculent dans un
+    thread) et s'arrête quand les requêtes qui l'utilisent encore l'ont libéré.
+    """
+    pool = None
+    if CORRECTION_WORKERS > 0 and nouveau.path:
+        pool = PoolCorrection(nouveau, CORRECTION_WORKERS)
+        try:
+            pool.prechauffer()
+        except BaseException:
+            pool.fermer()
+            raise
+    ancien = app.state.service
+    app.state.service = Service(nouveau, pool)
+    # Les paragraphes mémorisés par session ont été vérifiés avec l'ancien dictionnaire
+    VERIFICATEUR.vider()
+    if ancien.pool is not None:
+        ancien.pool.fermer(attendre=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Le dictionnaire est chargé au démarrage et partagé par tous les endpoints ;
+    # /admin/reload ou la surveillance des fichiers le remplacent sans redémarrage
+    try:
+        with metriques.etape("chargement_dictionnaire"):
+            dictionnaire = charger_dictionnaire()
+        print(f"✅ Dictionnaire chargé : {len(dictionnaire)} mots.")
+        stats = dictionnaire.statistiques()
+        if stats["frequences"]:
+            print(f"✅ Fréquences du corpus : {stats['candidats']} candidats aux suggestions")
+        if not stats["arbre_bk"]:
+            print("ℹ️  Aucun arbre BK à jour : recherche linéaire du mot proche")
+        if "index" in stats:
+            index = stats["index"]
+            taille = f"{index['variantes']} variantes" if "variantes" in index else f"{index['noeuds']} noeuds"
+            print(f"✅ Index {MOTEUR_CORRECTION} : {taille}, "
+                  f"{index['memoire_octets'] / 1e6:.1f} Mo, construit en {index['temps_construction_s']}s")
+    except FileNotFoundError:
+        print(f"❌ ERREUR : Impossible de trouver le fichier {DICTIONARY_PATH}")
+        dictionnaire = Dictionnaire([])
+
+    pool = None
+    if CORRECTION_WORKERS > 0 and dictionnaire.path:
+        pool = PoolCorrection(dictionnaire, CORRECTION_WORKERS)
+        print(f"✅ Pool de correction : {CORRECTION_WORKERS} processus")
+    app.state.service = Service(dictionnaire, pool)
+
+    app.state.rechargeur = Rechargeur(
+        charger_dictionnaire, installer_dictionnaire,
+        [DICTIONARY_PATH, DICTIONARY_BIN_PATH, BKTREE_PATH, FREQUENCES_PATH], RECHARGEMENT_INTERVALLE,
+    )
+    if RECHARGEMENT_AUTO:
+        app.state.rechargeur.surveiller()
+        print("✅ Rechargement automatique du dictionnaire activé")
+    yield
+    app.state.rechargeur.arreter()
+    if app.state.service.pool is not None:
+        app.state.service.pool.fermer()
+
 
-app = FastAPI()
+async def calculer_mot_proche(service, word):
+    """Mot proche calculé dans le pool de processus, sinon dans un thread"""
+    pool = service.pool
+    # Pool fermé par un rechargement : calcul sur le dictionnaire du même service
+    if pool is not None and pool.acquerir():
+        try:
+            return await pool.mot_proche(word)
+        finally:
+            pool.liberer()
+    return await run_in_threadpool(service.dictionnaire.mot_proche, word)
+
+
+async def calculer_mot_proche_lot(service, words, annulation=None):
+    pool = service.pool
+    if pool is not None and pool.acquerir():
+        try:
+            # Les parts du lot pas encore commencées sont abandonnées si la tâche est annulée
+            return await pool.mot_proche_lot(words)
+        finally:
+            pool.liberer()
+    return await run_in_threadpool(service.dictionnaire.mot_proche_lot, words, annulation)
+
+
+def cache_courant():
+    service = getattr(app.state, "service", None)
+    return None if service is None else service.dictionnaire.cache
+
+
+app = FastAPI(lifespan=lifespan)
+# Le cache des mots proches est relu à chaque lecture de /metrics
+metriques.REGISTRE.collecteurs.append(
+    metriques.collecteur_cache(cache_courant)
+)
+
+
+@app.middleware("http")
+async def mesurer_requetes(request: Request, call_next):
+    """
+    Latence de chaque requête par route (le modèle de la route, pas l'URL, pour borner
+    le nombre de séries). Avec l'en-tête X-Profile, la requête est aussi profilée.
+    Avec CORRECTION_WORKERS > 0, les calculs faits dans les processus du pool
+    n'apparaissent pas dans les étapes ni les évaluations.
+    """
+    profil = None
+    if PROFILE_TOKEN and request.headers.get("x-profile") == PROFILE_TOKEN:
+        profil = metriques.ProfilEchantillonnage()
+        jeton = metriques.PROFIL_COURANT.set(profil)
+        profil.demarrer()
+
+    debut = time.perf_counter()
+    statut = 500
+    try:
+        response = await call_next(request)
+        statut = response.status_code
+    finally:
+        route = request.scope.get("route")
+        metriques.DUREE_REQUETES.observer(
+            time.perf_counter() - debut, request.method, getattr(route, "path", "inconnue"), str(statut)
+        )
+        if profil is not None:
+            profil.arreter()
+            metriques.PROFIL_COURANT.reset(jeton)
+            metriques.PROFILS.put(profil.id, profil)
+
+    if profil is not None:
+        response.headers["X-Profile-Id"] = profil.id
+    return response
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,11 +230,79 @@ def read_item(item_id: int, q: Union[str, None] = None):
 
 #Endpoint pour Obtenir mot proche
 @app.get("/getClosedWord/{word}")
-def closed_word(word:str):
-    a_comparator=levenshtein.Levenshtein("Dictionnaire/teny_clean.txt")
-    mot_proche,dist=a_comparator.mot_proche(word)
+async def closed_word(word:str):
+    mot_proche,dist=await calculer_mot_proche(app.state.service, word)
     return {"closed_word":mot_proche,"distance":dist}
 
+#Endpoint pour Obtenir plusieurs suggestions classées (distance puis fréquence décroissante)
+@app.get("/suggest/{word}")
+def suggest(word: str, k: int = Query(5, ge=1, le=50), max_dist: Union[int, None] = Query(2, ge=0)):
+    suggestions = app.state.service.dictionnaire.top_k(word, k, max_dist)
+    return {
+        "word": word,
+        "suggestions": [{"word": mot, "distance": dist} for mot, dist in suggestions],
+    }
+
+#Endpoint pour la complétion automatique pendant la frappe
+@app.get("/complete/{prefix}")
+def complete(prefix: str, limit: int = Query(10, ge=1, le=50)):
+    return {"prefix": prefix, "completions": app.state.service.dictionnaire.completer(prefix, limit)}
+
+#Endpoint pour consulter le moteur de correction (taille, mémoire, temps de construction)
+@app.get("/stats")
+def stats():
+    return app.state.service.dictionnaire.statistiques()
+
+#Endpoint pour suivre le cache des mots proches (taux de hit, taille, évictions)
+@app.get("/stats/cache")
+def stats_cache():
+    return app.state.service.dictionnaire.cache.statistiques()
+
+#Endpoint des métriques (format d'exposition texte Prometheus)
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(metriques.REGISTRE.exposer(), media_type="text/plain; version=0.0.4")
+
+#Endpoint d'un profil enregistré (piles repliées, pour flamegraph.pl ou speedscope)
+@app.get("/metrics/profiles/{profile_id}", response_class=PlainTextResponse)
+def metrics_profile(profile_id: str):
+    profil = metriques.PROFILS.get(profile_id)
+    if profil is None:
+        raise HTTPException(status_code=404, detail="Profil inconnu ou expiré")
+    entete = f"# {sum(profil.echantillons.values())} échantillons en {profil.duree:.3f}s\n"
+    return PlainTextResponse(entete + profil.replie())
+
+#Accès réservé aux administrateurs (en-tête x-admin-token)
+def verifier_admin(request: Request):
+    if not ADMIN_TOKEN or request.headers.get("x-admin-token") != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide")
+
+
+#Endpoint Rechargement du dictionnaire sans redémarrer l'API
+@app.post("/admin/reload")
+async def admin_reload(request: Request, response: Response, wait: bool = False):
+    """
+    Reconstruit le dictionnaire (fichiers relus, index, moteur, cache vide) en arrière-plan
+    puis le met en place ; les requêtes en cours finissent sur l'ancien. Réponse 202
+    immédiate, ou le rapport (durée, mémoire) à la fin du rechargement avec wait=true.
+    """
+    verifier_admin(request)
+    rechargeur = app.state.rechargeur
+    lance = rechargeur.demander("/admin/reload")
+    if wait:
+        await run_in_threadpool(rechargeur.termine.wait)
+        return {"started": lance, "last": rechargeur.dernier}
+    response.status_code = 202
+    return {"started": lance, "last": rechargeur.dernier}
+
+
+@app.get("/admin/reload")
+def admin_reload_status(request: Request):
+    verifier_admin(request)
+    rechargeur = app.state.rechargeur
+    return {"running": rechargeur.en_cours, "last": rechargeur.dernier}
+
+
 #Endpoint pour detecter si un mot appartient au dictionnaire Malagasy
 @app.get("/verifyWord/{word}")
 def verify_word(word:str):
@@ -39,44 +310,224 @@ def verify_word(word:str):
 
 #######################################################################
 #######################################################################
-from pydantic import BaseModel
-import re
-import os
 
-DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), "Dictionnaire/teny_clean.txt")
-VALID_WORDS = set()
+# Regex pour isoler les mots (enlève ponctuation, chiffres)
+RE_MOT = re.compile(r"\b[a-zA-Zà-ÿÀ-Ÿ-]+\b")
 
-try:
-    with open(DICTIONARY_PATH, "r", encoding="utf-8") as f:
-        # On suppose un mot par ligne dans teny_clean.txt
-        content = f.read().splitlines()
-        VALID_WORDS = set(word.strip().lower() for word in content if word.strip())
-    print(f"✅ Dictionnaire chargé : {len(VALID_WORDS)} mots.")
-except FileNotFoundError:
-    print(f"❌ ERREUR : Impossible de trouver le fichier {DICTIONARY_PATH}")
+# Résultats par paragraphe mémorisés pour chaque session d'édition
+VERIFICATEUR = VerificateurIncremental(RE_MOT, regles=MalagasySpellChecker())
 
+# Paragraphe envoyé en entier, ou seulement par son hash s'il n'a pas changé
+class ParagraphPayload(BaseModel):
+    text: Union[str, None] = None
+    hash: Union[str, None] = None
+
+    @model_validator(mode="after")
+    def texte_ou_hash(self):
+        # Ni texte ni hash : requête mal formée (422), pas un paragraphe inconnu (409)
+        if self.text is None and self.hash is None:
+            raise ValueError("Chaque paragraphe doit avoir un texte ou un hash")
+        return self
 
 # Modèle de données reçu depuis React
 class TextPayload(BaseModel):
-    text: str
+    text: Union[str, None] = None
+    paragraphs: Union[List[ParagraphPayload], None] = None
+    session_id: Union[str, None] = None
+    # Ajouter les violations des règles orthographiques (lettres interdites, clusters...)
+    rules: bool = False
+
+# Texte complet ou liste de mots à corriger
+class CorrectionPayload(BaseModel):
+    text: Union[str, None] = None
+    words: Union[List[str], None] = None
 
 #Endpoint Verification le mot Fait partie du Dictionnaire
 @app.post("/check_spelling")
 def check_spelling(payload: TextPayload):
     """
-    Reçoit un texte, découpe les mots, et renvoie ceux qui ne sont pas dans le dictionnaire.
+    Reçoit un texte (ou ses paragraphes), et renvoie les mots qui ne sont pas dans le
+    dictionnaire avec leurs positions. Avec un session_id, seuls les paragraphes
+    modifiés depuis le dernier appel sont revérifiés ; les paragraphes inchangés
+    peuvent alors être envoyés par leur hash seulement.
+    Avec rules=true, les violations des règles orthographiques sont ajoutées avec
+    leurs positions dans "violations".
+    """
+    if payload.paragraphs is not None:
+        paragraphes = [(p.text, p.hash) for p in payload.paragraphs]
+    else:
+        paragraphes = [(p, None) for p in (payload.text or "").split("\n")]
+
+    try:
+        return VERIFICATEUR.verifier(
+            app.state.service.dictionnaire, paragraphes, payload.session_id, payload.rules
+        )
+    except ParagrapheInconnu as e:
+        # Le client doit renvoyer ce paragraphe en entier
+        raise HTTPException(status_code=409, detail=f"Paragraphe inconnu : {e.args[0]}")
+
+def mots_a_corriger(dictionnaire, words, text):
+    """Mots inconnus distincts de la liste et du texte, dans l'ordre d'apparition"""
+    words = list(words or [])
+    if text:
+        # Les mots d'une phrase du dictionnaire ("AC Milan") ne sont pas à corriger
+        for paragraphe in text.split("\n"):
+            words.extend(mot for mot, _, _ in VERIFICATEUR.verifier_paragraphe(dictionnaire, paragraphe))
+    return [
+        word for word in dict.fromkeys(w.strip() for w in words)
+        if len(word) > 1 and not dictionnaire.contient(word)
+    ]
+
+#Endpoint Correction de tout un document en une seule requête
+@app.post("/correct")
+async def correct(payload: CorrectionPayload):
+    """
+    Reçoit un texte et/ou une liste de mots, garde les mots inconnus distincts
+    et renvoie pour chacun le mot proche calculé en un seul passage.
+    """
+    # Une seule lecture : vérification et corrections avec le même dictionnaire, même si un rechargement a lieu
+    service = app.state.service
+    # Découpage et vérification hors de la boucle d'événements : un gros texte ne bloque pas les autres requêtes
+    unknown_words = await run_in_threadpool(mots_a_corriger, service.dictionnaire, payload.words, payload.text)
+    corrections = await calculer_mot_proche_lot(service, unknown_words)
+    return {
+        "corrections": {
+            word: {"suggestion": mot, "distance": dist}
+            for word, (mot, dist) in corrections.items()
+        }
+    }
+
+# Attente avant de calculer les corrections d'une édition : pendant la frappe, l'édition
+# suivante arrive avant et la vérification est annulée sans avoir rien calculé
+DELAI_CORRECTIONS_WS = 0.15
+
+
+class MessageInvalide(ValueError):
+    """Message WebSocket mal formé : renvoyé au client comme {"type": "error"}"""
+
+
+def entier(message, cle, defaut, minimum=0, maximum=None, optionnel=False):
+    valeur = message.get(cle, defaut)
+    if valeur is None and optionnel:
+        return None
+    # bool est un int en Python : refusé aussi
+    if not isinstance(valeur, int) or isinstance(valeur, bool) or valeur < minimum:
+        raise MessageInvalide(f"'{cle}' doit être un entier >= {minimum}")
+    return valeur if maximum is None else min(valeur, maximum)
+
+
+def valider_message(message):
+    """Vérifier les champs d'un message du client (type, version, index, text, word, k, max_dist)"""
+    if not isinstance(message, dict):
+        raise MessageInvalide("Le message doit être un objet JSON")
+    type_message = message.get("type")
+    if type_message == "edit":
+        # Absente : version précédente + 1 ; présente, elle doit être un entier (pas null)
+        if "version" in message:
+            entier(message, "version", None)
+        entier(message, "index", None, optionnel=True)
+        if not isinstance(message.get("text", ""), (str, type(None))):
+            raise MessageInvalide("'text' doit être une chaîne")
+        if not isinstance(message.get("delete", False), bool):
+            raise MessageInvalide("'delete' doit être un booléen")
+    elif type_message == "suggest":
+        if not isinstance(message.get("word", ""), (str, type(None))):
+            raise MessageInvalide("'word' doit être une chaîne")
+        entier(message, "k", 5, minimum=1)
+        entier(message, "max_dist", 2, optionnel=True)
+    else:
+        raise MessageInvalide(f"Type de message inconnu : {type_message}")
+    return type_message
+
+
+def fin_tache(tache):
+    """Récupérer l'exception d'une vérification terminée (sinon "Task exception was never retrieved")"""
+    if not tache.cancelled() and tache.exception() is not None:
+        print(f"❌ Vérification WebSocket : {tache.exception()!r}")
+
+
+#Canal WebSocket pour la vérification pendant l'édition
+@app.websocket("/ws/spell")
+async def ws_spell(websocket: WebSocket):
+    """
+    Une session par connexion. Le client envoie de petites éditions
+    ({"type": "edit", "version": n, "index": i, "text": ...}) et des demandes
+    de suggestions ({"type": "suggest", "word": w, "k": 5}). Le serveur renvoie
+    les marqueurs ("markers") puis les corrections des mots inconnus ; une
+    vérification en cours est annulée dès qu'une édition plus récente arrive,
+    calcul des corrections compris (arrêté entre deux mots). Un message mal formé
+    reçoit {"type": "error"} et la connexion continue.
     """
-    text = payload.text
-    # Regex pour isoler les mots (enlève ponctuation, chiffres)
-    words = re.findall(r"\b[a-zA-Zà-ÿÀ-Ÿ-]+\b", text)
-    
-    unknown_words = []
-    
-    for word in words:
-        clean_word = word.lower()
-        # Ignorer les mots très courts (1 lettre) ou s'ils sont dans le dico
-        if len(clean_word) > 1 and clean_word not in VALID_WORDS:
-            unknown_words.append(word)
-            
-    # On renvoie la liste unique pour éviter les doublons
-    return {"unknown": list(set(unknown_words))}
\ No newline at end of file
+    await websocket.accept()
+    session_id = f"ws:{uuid.uuid4().hex}"
+    paragraphes = [""]
+    version = 0
+    tache = None
+    annulation = None
+
+    async def verifier(version, snapshot, annulation):
+        service = app.state.service
+        resultat = await run_in_threadpool(
+            VERIFICATEUR.verifier, service.dictionnaire, [(p, None) for p in snapshot], session_id
+        )
+        await websocket.send_json({"type": "markers", "version": version, **resultat})
+        if resultat["unknown"]:
+            await asyncio.sleep(DELAI_CORRECTIONS_WS)
+            corrections = await calculer_mot_proche_lot(service, resultat["unknown"], annulation)
+            if annulation.is_set():
+                return
+            await websocket.send_json({
+                "type": "corrections",
+                "version": version,
+                "corrections": {
+                    word: {"suggestion": mot, "distance": dist}
+                    for word, (mot, dist) in corrections.items()
+                },
+            })
+
+    try:
+        while True:
+            texte = await websocket.receive_text()
+            try:
+                message = json.loads(texte)
+                type_message = valider_message(message)
+            except ValueError as e:
+                # json.JSONDecodeError et MessageInvalide sont des ValueError
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+
+            if type_message == "edit":
+                try:
+                    appliquer_edition(paragraphes, message)
+                except IndexError as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+                version = message.get("version", version + 1)
+                # Le résultat de l'ancienne vérification serait périmé : on l'abandonne,
+                # et le calcul des corrections s'arrête au mot suivant
+                if tache is not None and not tache.done():
+                    annulation.set()
+                    tache.cancel()
+                annulation = threading.Event()
+                tache = asyncio.create_task(verifier(version, list(paragraphes), annulation))
+                tache.add_done_callback(fin_tache)
+
+            elif type_message == "suggest":
+                word = message.get("word") or ""
+                k = entier(message, "k", 5, minimum=1, maximum=50)
+                max_dist = entier(message, "max_dist", 2, optionnel=True)
+                suggestions = await run_in_threadpool(
+                    app.state.service.dictionnaire.top_k, word, k, max_dist
+                )
+                await websocket.send_json({
+                    "type": "suggestions",
+                    "word": word,
+                    "suggestions": [{"word": mot, "distance": dist} for mot, dist in suggestions],
+                })
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if tache is not None and not tache.done():
+            annulation.set()
+            tache.cancel()
+        VERIFICATEUR.sessions.supprimer(session_id)
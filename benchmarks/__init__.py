@@ -0,0 +1,8 @@
+"""
+Benchmarks reproductibles (hors ligne) des chemins critiques de correction et de vérification.
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks                         # suite complète, résultats JSON sur la sortie
+    python -m benchmarks --rapide --sortie r.json
+    python -m benchmarks --baseline benchmarks/baseline.json   # code 1 en cas de régression
+"""
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.join(RACINE, "Scraping"))
+
+from benchmarks import charges
+from benchmarks.mesure import comparer, mesurer
+
+
+def nb_mots(texte):
+    return len(texte.split())
+
+
+def cas_levenshtein(rng, mots, rapide):
+    from module_IA.levenshtein import Levenshtein
+
+    moteur = Levenshtein(mots=mots)
+    paires = [(faute, rng.choice(mots)) for faute in charges.fautes(rng, mots, 500 if rapide else 2000)]
+    yield "levenshtein", mesurer(lambda p: moteur.levenshtein(*p), paires, unite="distances/s")
+    yield "levenshtein_borne_2", mesurer(lambda p: moteur.levenshtein(*p, max_dist=2), paires,
+                                         unite="distances/s")
+
+
+def cas_mot_proche(rng, mots, rapide):
+    from module_IA.levenshtein import Levenshtein
+
+    for taille in (10000,) if rapide else (10000, len(mots)):
+        dico = charges.dictionnaire_taille(rng, mots, taille)
+        moteur = Levenshtein(mots=dico)
+        requetes = charges.fautes(rng, dico, 5 if rapide else 20)
+        yield f"mot_proche_{taille}", mesurer(moteur.mot_proche, requetes, unite="requêtes/s",
+                                              echantillon_memoire=2)
+
+
+def cas_check_spelling(rng, mots, rapide):
+    from api import RE_MOT
+    from module_IA.dictionnaire import Dictionnaire
+    from module_IA.incremental import VerificateurIncremental
+
+    dictionnaire = Dictionnaire(mots, moteur="levenshtein")
+    verificateur = VerificateurIncremental(RE_MOT)
+
+    def verifier(texte):
+        return verificateur.verifier(dictionnaire, [(p, None) for p in texte.split("\n")])
+
+    for taille, repetitions in documents(rapide):
+        textes = [charges.document(rng, mots, taille) for _ in range(repetitions)]
+        yield f"check_spelling_{taille}", mesurer(verifier, textes, nb_mots, unite="mots/s")
+
+
+def cas_check_text(rng, mots, rapide):
+    from module_IA.verificationmot import MalagasySpellChecker
+
+    checker = MalagasySpellChecker()
+    for taille, repetitions in documents(rapide):
+        textes = [charges.document(rng, mots, taille) for _ in range(repetitions)]
+        yield f"check_text_{taille}", mesurer(checker.check_text, textes, nb_mots, unite="mots/s")
+
+
+def cas_clean_file(rng, mots, rapide):
+    import contextlib
+    import io
+
+    from clean import TextCleaner
+
+    nombre = 20000 if rapide else 100000
+    with tempfile.TemporaryDirectory() as dossier:
+        source = os.path.join(dossier, "teny.txt")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("\n".join(charges.lignes_brutes(rng, mots, nombre)) + "\n")
+        cleaner = TextCleaner(source, os.path.join(dossier, "teny_clean.txt"))
+
+        def nettoyer(_):
+            with contextlib.redirect_stdout(io.StringIO()):
+                cleaner.clean_file()
+
+        yield f"clean_file_{nombre}", mesurer(nettoyer, [None] * 4, lambda _: nombre, unite="lignes/s",
+                                             echantillon_memoire=1)
+
+
+def documents(rapide):
+    """(nombre de mots, nombre de documents)"""
+    if rapide:
+        return [(1000, 10), (10000, 3)]
+    return [(1000, 20), (10000, 5), (100000, 2)]
+
+
+# Marge tolérée par rapport à la baseline, par préfixe de cas, d'après l'écart observé
+# entre plusieurs mesures du même code : les cas de quelques documents (check_text)
+# et les appels de l'ordre de la microseconde (levenshtein) varient davantage.
+TOLERANCES = {
+    "levenshtein": 1.4,
+    "mot_proche": 1.35,
+    "check_spelling": 1.35,
+    "check_text": 1.5,
+    "clean_file": 1.35,
+}
+TOLERANCE_DEFAUT = 1.4
+
+
+def tolerance_cas(nom, seuil=None):
+    if seuil is not None:
+        return seuil
+    prefixes = [p for p in TOLERANCES if nom.startswith(p)]
+    return TOLERANCES[max(prefixes, key=len)] if prefixes else TOLERANCE_DEFAUT
+
+
+CAS = {
+    "levenshtein": cas_levenshtein,
+    "mot_proche": cas_mot_proche,
+    "check_spelling": cas_check_spelling,
+    "check_text": cas_check_text,
+    "clean_file": cas_clean_file,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks des chemins critiques (hors ligne, graine fixe)")
+    parser.add_argument("cas", nargs="*", help=f"Cas à lancer parmi {', '.join(CAS)} (défaut : tous)")
+    parser.add_argument("--rapide", action="store_true", help="Charges réduites (CI)")
+    parser.add_argument("--graine", type=int, default=42)
+    parser.add_argument("--sortie", help="Écrire les résultats JSON dans ce fichier (ex. nouvelle baseline)")
+    parser.add_argument("--baseline", help="Résultats de référence à comparer")
+    parser.add_argument("--seuil", type=float,
+                        help="Régression si le temps total > seuil x celui de la baseline, pour tous les cas "
+                             "(défaut : tolérance propre à chaque cas, voir TOLERANCES)")
+    args = parser.parse_args()
+    for nom in args.cas:
+        if nom not in CAS:
+            parser.error(f"cas inconnu : {nom}")
+
+    mots = charges.charger_mots()
+    resultats = {}
+    for nom in args.cas or CAS:
+        # Une graine par cas : lancer un cas seul donne les mêmes charges
+        rng = random.Random(f"{args.graine}:{nom}")
+        for cle, mesure in CAS[nom](rng, mots, args.rapide):
+            resultats[cle] = mesure
+            print(f"{cle:<24} total {mesure['total_min_ms']:>10.3f} ms  p50 {mesure['p50_ms']:>10.3f} ms  p99 {mesure['p99_ms']:>10.3f} ms  "
+                  f"{mesure['debit']:>12,.0f} {mesure['unite']:<12} pic {mesure['memoire_pic_ko']:>9.0f} Ko",
+                  file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["rapide"] != args.rapide:
+            print("⚠️  Baseline mesurée avec d'autres charges (--rapide)", file=sys.stderr)
+        regressions = comparer(resultats, baseline["resultats"], lambda nom: tolerance_cas(nom, args.seuil))
+        for nom, ratio, seuil in regressions:
+            print(f"❌ Régression {nom} : temps total x{ratio:.2f} (seuil x{seuil})", file=sys.stderr)
+
+    rapport = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plateforme": platform.platform(),
+            "graine": args.graine,
+            "rapide": args.rapide,
+            "mots_dictionnaire": len(mots),
+        },
+        "resultats": resultats,
+    }
+    texte = json.dumps(rapport, ensure_ascii=False, indent=2)
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            f.write(texte + "\n")
+    else:
+        print(texte)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
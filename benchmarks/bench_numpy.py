@@ -0,0 +1,48 @@
+"""
+Comparaison du moteur NumPy et de la boucle Python pure pour mot_proche.
+
+Usage (depuis la racine du projet) :
+    python benchmarks/bench_numpy.py
+    python benchmarks/bench_numpy.py --tailles 10000 141950 1000000 --requetes 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.charges import charger_mots, dictionnaire_taille, muter
+from module_IA import levenshtein
+from module_IA.vectorise import LevenshteinNumpy
+
+
+def chronometrer(moteur, requetes):
+    debut = time.perf_counter()
+    resultats = [moteur.mot_proche(q) for q in requetes]
+    return (time.perf_counter() - debut) / len(requetes), resultats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mot_proche : NumPy vs Python pur")
+    parser.add_argument("--tailles", type=int, nargs="+", default=[10000, 141950, 1000000])
+    parser.add_argument("--requetes", type=int, default=5)
+    parser.add_argument("--graine", type=int, default=42)
+    args = parser.parse_args()
+
+    mots = charger_mots()
+    print(f"{'taille':>10} {'python (s/req)':>15} {'numpy (s/req)':>15} {'accélération':>13} {'identiques':>11}")
+    for taille in args.tailles:
+        rng = random.Random(args.graine)
+        dico = dictionnaire_taille(rng, mots, taille)
+        requetes = [muter(rng, rng.choice(dico), rng.randint(1, 2)) for _ in range(args.requetes)]
+
+        t_python, r_python = chronometrer(levenshtein.Levenshtein(mots=dico), requetes)
+        t_numpy, r_numpy = chronometrer(LevenshteinNumpy(dico), requetes)
+        print(f"{taille:>10} {t_python:>15.4f} {t_numpy:>15.4f} {t_python / t_numpy:>12.1f}x "
+              f"{str(r_python == r_numpy):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Charges de travail déterministes (graine fixe) construites à partir du dictionnaire"""
+import os
+
+from module_IA import levenshtein
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), "..", "Dictionnaire/teny_clean.txt")
+LETTRES = "abdefghijklmnoprstvyz"
+PONCTUATION = [",", ".", ";", "?", "!"]
+
+
+def charger_mots():
+    return levenshtein.charger_mots(DICTIONARY_PATH)
+
+
+def muter(rng, mot, nb_editions):
+    """Appliquer nb_editions substitutions / suppressions / insertions aléatoires"""
+    mot = list(mot)
+    for _ in range(nb_editions):
+        op = rng.choice("sdi") if len(mot) > 1 else "i"
+        i = rng.randrange(len(mot))
+        if op == "s":
+            mot[i] = rng.choice(LETTRES)
+        elif op == "d":
+            del mot[i]
+        else:
+            mot.insert(i, rng.choice(LETTRES))
+    return "".join(mot)
+
+
+def dictionnaire_taille(rng, mots, taille):
+    """Échantillon du dictionnaire, ou extension par mots mutés au-delà de sa taille"""
+    if taille <= len(mots):
+        return rng.sample(mots, taille)
+    resultat = list(mots)
+    while len(resultat) < taille:
+        resultat.append(muter(rng, rng.choice(mots), rng.randint(1, 3)))
+    return resultat
+
+
+def fautes(rng, mots, nombre):
+    """Mots mal orthographiés : 1 ou 2 éditions aléatoires d'un mot du dictionnaire"""
+    return [muter(rng, rng.choice(mots), rng.randint(1, 2)) for _ in range(nombre)]
+
+
+def document(rng, mots, nb_mots, taux_fautes=0.05, mots_par_paragraphe=80):
+    """Texte de nb_mots mots en paragraphes, avec une proportion de mots fautifs et de ponctuation"""
+    paragraphes = []
+    courant = []
+    for _ in range(nb_mots):
+        mot = rng.choice(mots)
+        if rng.random() < taux_fautes:
+            mot = muter(rng, mot, rng.randint(1, 2))
+        if rng.random() < 0.1:
+            mot += rng.choice(PONCTUATION)
+        courant.append(mot)
+        if len(courant) >= mots_par_paragraphe:
+            paragraphes.append(" ".join(courant))
+            courant = []
+    if courant:
+        paragraphes.append(" ".join(courant))
+    return "\n".join(paragraphes)
+
+
+def lignes_brutes(rng, mots, nombre):
+    """Lignes comme celles du scraping : parenthèses, traductions après '/', crochets, chiffres"""
+    lignes = []
+    for _ in range(nombre):
+        ligne = rng.choice(mots)
+        r = rng.random()
+        if r < 0.1:
+            ligne += f" ({rng.choice(mots)})"
+        elif r < 0.15:
+            ligne += f" / {rng.choice(mots)}"
+        elif r < 0.2:
+            ligne += f" [{rng.randint(1, 99)}]"
+        elif r < 0.25:
+            ligne = f"{rng.randint(1, 999)} {ligne}"
+        lignes.append(ligne)
+    return lignes
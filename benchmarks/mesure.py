@@ -0,0 +1,91 @@
+"""Mesure d'un cas : latences (p50/p99), débit et pic mémoire (tracemalloc)"""
+import time
+import tracemalloc
+
+
+def quantile(valeurs_triees, q):
+    """Quantile par rang le plus proche sur des valeurs triées"""
+    i = min(len(valeurs_triees) - 1, max(0, round(q * len(valeurs_triees)) - 1))
+    return valeurs_triees[i]
+
+
+def calibrer():
+    """
+    Durée (s) d'une charge Python fixe. Mesurée avant chaque passe, elle suit la vitesse
+    du moment de la machine (fréquence, voisins sur la même machine), qui varie bien
+    plus que le code mesuré : les durées divisées par elle restent comparables d'une
+    exécution à l'autre.
+    """
+    debut = time.perf_counter()
+    total = 0
+    for i in range(100000):
+        total += (i * 7) % 13
+    "".join(str(i) for i in range(10000)).count("7")
+    return time.perf_counter() - debut
+
+
+def mesurer(fonction, entrees, volume=lambda entree: 1, unite="appels/s", echantillon_memoire=5, passes=7):
+    """
+    Appeler fonction(entree) pour chaque entrée : une passe d'échauffement sur toutes
+    les entrées, puis `passes` passes chronométrées. Chaque entrée garde sa durée
+    minimale (le bruit de la machine ne fait qu'ajouter du temps). La valeur comparée
+    à la baseline est "total_relatif" : la somme des minimums, chaque durée étant
+    rapportée à la charge de calibrage mesurée juste avant sa passe.
+    Le débit est exprimé en `unite` : somme des volume(entree) par seconde.
+    Le pic mémoire est mesuré à part sur les premières entrées, tracemalloc
+    ralentissant fortement les appels.
+    """
+    for entree in entrees:
+        fonction(entree)
+
+    durees = [float("inf")] * len(entrees)
+    relatives = [float("inf")] * len(entrees)
+    for _ in range(passes):
+        reference = min(calibrer() for _ in range(3))
+        for i, entree in enumerate(entrees):
+            debut = time.perf_counter()
+            fonction(entree)
+            duree = time.perf_counter() - debut
+            durees[i] = min(durees[i], duree)
+            relatives[i] = min(relatives[i], duree / reference)
+
+    tracemalloc.start()
+    try:
+        for entree in entrees[:echantillon_memoire]:
+            fonction(entree)
+        pic = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    total = sum(durees)
+    triees = sorted(durees)
+    return {
+        "n": len(entrees),
+        "passes": passes,
+        "total_min_ms": round(total * 1000, 4),
+        "total_relatif": round(sum(relatives), 4),
+        "p50_ms": round(quantile(triees, 0.50) * 1000, 4),
+        "p99_ms": round(quantile(triees, 0.99) * 1000, 4),
+        "moyenne_ms": round(total / len(durees) * 1000, 4),
+        "debit": round(sum(volume(e) for e in entrees) / total, 1) if total else None,
+        "unite": unite,
+        "memoire_pic_ko": round(pic / 1024, 1),
+    }
+
+
+def comparer(resultats, baseline, tolerance):
+    """
+    Cas dont le temps total (somme des minimums par entrée) dépasse tolerance(nom) x
+    celui de la baseline : [(nom, ratio, seuil)]
+    """
+    regressions = []
+    for nom, mesure in resultats.items():
+        reference = baseline.get(nom)
+        if reference is None or not reference.get("total_relatif"):
+            continue
+        ratio = mesure["total_relatif"] / reference["total_relatif"]
+        seuil = tolerance(nom)
+        mesure["ratio_baseline"] = round(ratio, 3)
+        if ratio > seuil:
+            regressions.append((nom, ratio, seuil))
+    return regressions
@@ -0,0 +1,213 @@
+import time
+from array import array
+
+from module_IA import metriques
+
+
+class _Noeud:
+    __slots__ = ("final", "aretes")
+
+    def __init__(self):
+        self.final = False
+        self.aretes = {}
+
+    def signature(self):
+        # Les enfants sont déjà minimisés (uniques dans le registre) : leur id suffit
+        return (self.final, tuple(sorted((c, id(e)) for c, e in self.aretes.items())))
+
+
+class Automate:
+    """
+    Automate acyclique minimal (DAWG) des mots du dictionnaire.
+    Les préfixes et les suffixes communs (mi-/man-/-ana...) sont partagés, puis
+    l'automate est compacté dans des tableaux : pour chaque noeud, ses arêtes
+    sont une tranche de `etiquettes` (lettres triées) et de `cibles` (noeuds).
+    Sert à l'appartenance et à la recherche approchée bornée (ligne de Levenshtein
+    propagée le long de l'automate, moteur MoteurAutomate).
+    """
+
+    def __init__(self, mots):
+        self.nb_mots = 0
+        racine = self.construire(sorted(set(mots)))
+        self.compacter(racine)
+
+    def construire(self, mots):
+        """Construction incrémentale de Daciuk et al. (mots triés et uniques)"""
+        registre = {}
+        racine = _Noeud()
+        chemin = []  # arêtes (parent, lettre, enfant) du dernier mot, pas encore minimisées
+
+        def minimiser(jusqu_a):
+            while len(chemin) > jusqu_a:
+                parent, c, enfant = chemin.pop()
+                cle = enfant.signature()
+                existant = registre.get(cle)
+                if existant is not None:
+                    parent.aretes[c] = existant
+                else:
+                    registre[cle] = enfant
+
+        precedent = ""
+        for mot in mots:
+            commun = 0
+            while commun < min(len(mot), len(precedent)) and mot[commun] == precedent[commun]:
+                commun += 1
+            minimiser(commun)
+
+            noeud = chemin[-1][2] if chemin else racine
+            for c in mot[commun:]:
+                nouveau = _Noeud()
+                noeud.aretes[c] = nouveau
+                chemin.append((noeud, c, nouveau))
+                noeud = nouveau
+            noeud.final = True
+            self.nb_mots += 1
+            precedent = mot
+        minimiser(0)
+        return racine
+
+    def compacter(self, racine):
+        """Numéroter les noeuds (parcours en largeur) et les ranger dans des tableaux"""
+        numeros = {id(racine): 0}
+        ordre = [racine]
+        for noeud in ordre:
+            for c in sorted(noeud.aretes):
+                enfant = noeud.aretes[c]
+                if id(enfant) not in numeros:
+                    numeros[id(enfant)] = len(ordre)
+                    ordre.append(enfant)
+
+        self.debut = array("I", [0])
+        self.cibles = array("I")
+        self.finaux = bytearray(len(ordre))
+        etiquettes = []
+        for i, noeud in enumerate(ordre):
+            self.finaux[i] = noeud.final
+            for c in sorted(noeud.aretes):
+                etiquettes.append(c)
+                self.cibles.append(numeros[id(noeud.aretes[c])])
+            self.debut.append(len(self.cibles))
+        self.etiquettes = "".join(etiquettes)
+
+    def __len__(self):
+        return self.nb_mots
+
+    def nb_noeuds(self):
+        return len(self.finaux)
+
+    def memoire(self):
+        """Taille des tableaux de l'automate en octets"""
+        return (self.debut.itemsize * len(self.debut) + self.cibles.itemsize * len(self.cibles)
+                + len(self.finaux) + len(self.etiquettes.encode("utf-8")))
+
+    def transition(self, noeud, c):
+        """Noeud atteint depuis noeud par la lettre c (-1 si aucune arête)"""
+        i = self.etiquettes.find(c, self.debut[noeud], self.debut[noeud + 1])
+        return -1 if i < 0 else self.cibles[i]
+
+    def noeud_prefixe(self, prefixe):
+        debut, etiquettes, cibles = self.debut, self.etiquettes, self.cibles
+        noeud = 0
+        for c in prefixe:
+            i = etiquettes.find(c, debut[noeud], debut[noeud + 1])
+            if i < 0:
+                return -1
+            noeud = cibles[i]
+        return noeud
+
+    def __contains__(self, mot):
+        noeud = self.noeud_prefixe(mot)
+        return noeud >= 0 and self.finaux[noeud] == 1
+
+    def recherche_floue(self, mot, max_dist):
+        """
+        Mots à distance de Levenshtein <= max_dist, triés par (distance, mot).
+        Chaque branche porte la ligne DP de son préfixe ; elle est abandonnée dès
+        que le minimum de la ligne dépasse max_dist.
+        """
+        n = len(mot)
+        resultats = []
+        pile = [(0, "", list(range(n + 1)))]
+        lignes = 0
+        while pile:
+            noeud, prefixe, ligne = pile.pop()
+            if self.finaux[noeud] and ligne[n] <= max_dist:
+                resultats.append((ligne[n], prefixe))
+
+            for i in range(self.debut[noeud], self.debut[noeud + 1]):
+                c = self.etiquettes[i]
+                lignes += 1
+                nouvelle = [ligne[0] + 1]
+                for j in range(1, n + 1):
+                    cout = 0 if mot[j - 1] == c else 1
+                    nouvelle.append(min(nouvelle[j - 1] + 1, ligne[j] + 1, ligne[j - 1] + cout))
+                if min(nouvelle) <= max_dist:
+                    pile.append((self.cibles[i], prefixe + c, nouvelle))
+
+        metriques.compter_evaluations(lignes)
+        resultats.sort()
+        return [(m, d) for d, m in resultats]
+
+
+class MoteurAutomate:
+    """
+    Moteur de correction par recherche approchée dans un automate des candidats
+    (casse conservée, comme pour les autres moteurs). Le rayon augmente de 1 à
+    max_dist tant que rien n'est trouvé ; au-delà, le moteur de repli (parcours
+    exact) répond. Les distances égales sont départagées par la position du mot
+    dans la liste des candidats, comme les autres moteurs.
+    """
+
+    def __init__(self, mots, max_dist=2, repli=None):
+        self.mots = mots
+        self.max_dist = max_dist
+        self.repli = repli
+        debut = time.perf_counter()
+        # Position de la première occurrence de chaque mot : le départage des autres moteurs
+        self.rang = {}
+        for index, mot in enumerate(mots):
+            self.rang.setdefault(mot, index)
+        self.automate = Automate(self.rang)
+        self.temps_construction = time.perf_counter() - debut
+
+    def recherche(self, word, max_dist):
+        resultats = self.automate.recherche_floue(word, max_dist)
+        resultats.sort(key=lambda r: (r[1], self.rang[r[0]]))
+        return resultats
+
+    def within(self, word, max_dist=None):
+        """Mots à distance <= max_dist, triés par distance puis ordre des candidats"""
+        if max_dist is None:
+            max_dist = self.max_dist
+        elif max_dist > self.max_dist and self.repli is not None:
+            # Au-delà du rayon prévu, la recherche dans l'automate explose : parcours exact
+            return self.repli.within(word, max_dist)
+        return self.recherche(word, max_dist)
+
+    def top_k(self, word, k, max_dist=None):
+        """Les k meilleurs mots ; le repli n'est utilisé que si l'automate n'en trouve pas assez"""
+        if max_dist is not None and max_dist <= self.max_dist:
+            return self.recherche(word, max_dist)[:k]
+        resultats = self.recherche(word, self.max_dist)
+        # Tout autre mot est à distance > self.max_dist : ces k-là sont les meilleurs
+        if len(resultats) >= k or self.repli is None:
+            return resultats[:k]
+        return self.repli.top_k(word, k, max_dist)
+
+    def mot_proche(self, word):
+        """Même interface que Levenshtein.mot_proche"""
+        for rayon in range(1, self.max_dist + 1):
+            resultats = self.recherche(word, rayon)
+            if resultats:
+                return resultats[0]
+        if self.repli is not None:
+            return self.repli.mot_proche(word)
+        return None, float("inf")
+
+    def statistiques(self):
+        return {
+            "mots": len(self.automate),
+            "noeuds": self.automate.nb_noeuds(),
+            "memoire_octets": self.automate.memoire(),
+            "temps_construction_s": round(self.temps_construction, 3),
+        }
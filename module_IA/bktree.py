@@ -0,0 +1,366 @@
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+from module_IA import levenshtein, metriques
+
+# Arbre aplati (fichier .bktree et section index du .bin) : magic, version, nombre de
+# noeuds, nombre d'arêtes, signature des candidats ; puis les tableaux, alignés sur 8 octets
+MAGIC = b"BKPL"
+VERSION_FORMAT = 2
+ENTETE = struct.Struct("<4sIII40s")
+
+
+def aligner(n):
+    return (n + 7) // 8 * 8
+
+
+def signature_mots(mots):
+    """Empreinte de la liste de mots (ordre compris) pour détecter un index périmé"""
+    h = hashlib.sha1()
+    for mot in mots:
+        h.update(mot.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class BKTree:
+    """
+    Arbre BK (Burkhard-Keller) sur la distance de Levenshtein.
+    Chaque noeud est une liste [mot, index dans le dictionnaire, {distance: enfant}].
+    L'inégalité triangulaire permet de n'explorer qu'une petite partie des mots,
+    et l'index d'origine sert à départager les égalités comme le parcours linéaire.
+    La signature (frequences.signature_candidats) identifie la liste de candidats
+    pour laquelle l'arbre a été construit.
+    """
+
+    def __init__(self, mots=None, signature=None):
+        self.racine = None
+        self.taille = 0
+        self.signature = None
+        if mots is not None:
+            self.construire(mots, signature)
+
+    def construire(self, mots, signature=None):
+        """Insérer tous les mots dans l'ordre du dictionnaire"""
+        self.racine = None
+        self.taille = 0
+        for index, mot in enumerate(mots):
+            self.ajouter(mot, index)
+        self.signature = signature
+
+    def ajouter(self, mot, index):
+        noeud = [mot, index, {}]
+        if self.racine is None:
+            self.racine = noeud
+            self.taille = 1
+            return
+
+        courant = self.racine
+        while True:
+            d = levenshtein.distance(mot, courant[0])
+            # Mot identique deja present : le premier index garde la priorite
+            if d == 0:
+                return
+            enfant = courant[2].get(d)
+            if enfant is None:
+                courant[2][d] = noeud
+                self.taille += 1
+                return
+            courant = enfant
+
+    def mot_proche(self, word):
+        """Même résultat que Levenshtein.mot_proche (premier mot à distance minimale)"""
+        if self.racine is None:
+            return None, float("inf")
+
+        best_dist, best_index, best_word = float("inf"), float("inf"), None
+        pile = [self.racine]
+        evaluations = 0
+        while pile:
+            mot, index, enfants = pile.pop()
+            r = best_dist
+            # Au-delà de r + la plus grande arête, ni le noeud ni ses enfants ne peuvent servir
+            borne = None if best_word is None else r + max(enfants, default=0)
+            d = levenshtein.distance(word, mot, borne)
+            evaluations += 1
+            if borne is not None and d > borne:
+                continue
+            if d < best_dist or (d == best_dist and index < best_index):
+                best_dist, best_index, best_word = d, index, mot
+
+            # Les enfants les plus prometteurs sont empilés en dernier
+            r = best_dist
+            candidats = [(abs(k - d), enfant) for k, enfant in enfants.items() if d - r <= k <= d + r]
+            candidats.sort(key=lambda c: c[0], reverse=True)
+            pile.extend(enfant for _, enfant in candidats)
+
+        metriques.compter_evaluations(evaluations)
+        return best_word, best_dist
+
+    def within(self, word, max_dist):
+        """Tous les mots à distance <= max_dist, triés par (distance, ordre du dictionnaire)"""
+        resultats = []
+        if self.racine is None:
+            return resultats
+
+        pile = [self.racine]
+        while pile:
+            mot, index, enfants = pile.pop()
+            borne = max_dist + max(enfants, default=0)
+            d = levenshtein.distance(word, mot, borne)
+            if d > borne:
+                continue
+            if d <= max_dist:
+                resultats.append((d, index, mot))
+            for k, enfant in enfants.items():
+                if d - max_dist <= k <= d + max_dist:
+                    pile.append(enfant)
+
+        resultats.sort()
+        return [(mot, d) for d, _, mot in resultats]
+
+    def top_k(self, word, k, max_dist=None):
+        """Les k meilleurs mots (distance, puis ordre du dictionnaire) en un seul parcours"""
+        tas = []  # (-distance, -index, mot) : le pire candidat au sommet
+        if self.racine is None or k <= 0:
+            return []
+
+        pile = [self.racine]
+        while pile:
+            mot, index, enfants = pile.pop()
+            # Rayon courant : max_dist, resserré par le pire candidat une fois le tas plein
+            r = float("inf") if max_dist is None else max_dist
+            if len(tas) == k:
+                r = min(r, -tas[0][0])
+            borne = None if r == float("inf") else r + max(enfants, default=0)
+            d = levenshtein.distance(word, mot, borne)
+            if borne is not None and d > borne:
+                continue
+
+            if d <= r:
+                if len(tas) < k:
+                    heapq.heappush(tas, (-d, -index, mot))
+                elif (-d, -index) > tas[0][:2]:
+                    heapq.heapreplace(tas, (-d, -index, mot))
+                if len(tas) == k:
+                    r = min(r, -tas[0][0])
+
+            candidats = [(abs(c - d), enfant) for c, enfant in enfants.items() if d - r <= c <= d + r]
+            candidats.sort(key=lambda c: c[0], reverse=True)
+            pile.extend(enfant for _, enfant in candidats)
+
+        return [(mot, -d) for d, _, mot in sorted(tas, reverse=True)]
+
+    def aplatir(self):
+        """
+        Arbre sous forme de tableaux (octets), noeuds numérotés en largeur depuis la racine :
+        rang de chaque noeud, offsets et octets UTF-8 des mots, début des arêtes de chaque
+        noeud, puis cible et distance de chaque arête (triées par distance).
+        """
+        noeuds = [] if self.racine is None else [self.racine]
+        rangs = array("I")
+        offsets_mots = array("I", [0])
+        debut = array("I", [0])
+        cibles = array("I")
+        distances = bytearray()
+        mots = bytearray()
+        for mot, index, enfants in noeuds:
+            rangs.append(index)
+            mots += mot.encode("utf-8")
+            offsets_mots.append(len(mots))
+            for d in sorted(enfants):
+                cibles.append(len(noeuds))
+                distances.append(d)
+                noeuds.append(enfants[d])
+            debut.append(len(cibles))
+
+        if sys.byteorder != "little":
+            for tableau in (rangs, offsets_mots, debut, cibles):
+                tableau.byteswap()
+        donnees = bytearray(ENTETE.pack(MAGIC, VERSION_FORMAT, len(noeuds), len(cibles),
+                                        (self.signature or "").encode("ascii")))
+        for section in (rangs, offsets_mots, debut, cibles, distances, mots):
+            donnees += b"\0" * (aligner(len(donnees)) - len(donnees))
+            donnees += section.tobytes() if isinstance(section, array) else section
+        return bytes(donnees)
+
+    def sauvegarder(self, path):
+        """Écrire l'arbre aplati, relu sans désérialisation par ArbreBKPlat.charger"""
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.aplatir())
+        os.replace(tmp, path)
+
+
+class ArbreBKPlat:
+    """
+    Arbre BK aplati (BKTree.aplatir), lu directement dans un tampon : fichier .bktree
+    projeté en mémoire ou section index du dictionnaire binaire. Rien n'est désérialisé
+    au chargement et les pages sont partagées entre les processus qui ouvrent le même
+    fichier ; chaque mot n'est décodé que quand la recherche passe par son noeud.
+    Mêmes résultats que BKTree.
+    """
+
+    def __init__(self, tampon):
+        vue = memoryview(tampon)
+        magic, version, self.taille, nb_aretes, signature = ENTETE.unpack_from(vue, 0)
+        if magic != MAGIC or version != VERSION_FORMAT:
+            raise ValueError("Format d'arbre BK invalide")
+        if sys.byteorder != "little":
+            raise ValueError("L'arbre BK est stocké en petit-boutiste")
+        self.signature = signature.rstrip(b"\0").decode("ascii") or None
+
+        position = ENTETE.size
+        sections = []
+        for taille in (4 * self.taille, 4 * (self.taille + 1), 4 * (self.taille + 1), 4 * nb_aretes, nb_aretes):
+            position = aligner(position)
+            sections.append(vue[position:position + taille])
+            position += taille
+        position = aligner(position)
+        self.rangs, self.offsets_mots, self.debut, self.cibles = (section.cast("I") for section in sections[:4])
+        self.distances = sections[4]
+        self.mots = vue[position:]
+
+    @classmethod
+    def charger(cls, path):
+        """Arbre du fichier (projeté en mémoire) ; None si ce n'est pas un arbre aplati à jour"""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < ENTETE.size:
+                return None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mm)
+        except ValueError:
+            mm.close()
+            return None
+
+    def mot(self, noeud):
+        return str(self.mots[self.offsets_mots[noeud]:self.offsets_mots[noeud + 1]], "utf-8")
+
+    def mot_proche(self, word):
+        """Même résultat que Levenshtein.mot_proche (premier mot à distance minimale)"""
+        if not self.taille:
+            return None, float("inf")
+
+        rangs, debut, cibles, distances = self.rangs, self.debut, self.cibles, self.distances
+        best_dist, best_index, best_word = float("inf"), float("inf"), None
+        pile = [0]
+        evaluations = 0
+        while pile:
+            noeud = pile.pop()
+            a, b = debut[noeud], debut[noeud + 1]
+            mot = self.mot(noeud)
+            r = best_dist
+            # Arêtes triées : la plus grande distance est la dernière
+            borne = None if best_word is None else r + (distances[b - 1] if b > a else 0)
+            d = levenshtein.distance(word, mot, borne)
+            evaluations += 1
+            if borne is not None and d > borne:
+                continue
+            index = rangs[noeud]
+            if d < best_dist or (d == best_dist and index < best_index):
+                best_dist, best_index, best_word = d, index, mot
+
+            # Les enfants les plus prometteurs sont empilés en dernier
+            r = best_dist
+            candidats = [(abs(distances[e] - d), cibles[e]) for e in range(a, b) if d - r <= distances[e] <= d + r]
+            candidats.sort(key=lambda c: c[0], reverse=True)
+            pile.extend(enfant for _, enfant in candidats)
+
+        metriques.compter_evaluations(evaluations)
+        return best_word, best_dist
+
+    def within(self, word, max_dist):
+        """Tous les mots à distance <= max_dist, triés par (distance, ordre du dictionnaire)"""
+        resultats = []
+        if not self.taille:
+            return resultats
+
+        rangs, debut, cibles, distances = self.rangs, self.debut, self.cibles, self.distances
+        pile = [0]
+        while pile:
+            noeud = pile.pop()
+            a, b = debut[noeud], debut[noeud + 1]
+            mot = self.mot(noeud)
+            borne = max_dist + (distances[b - 1] if b > a else 0)
+            d = levenshtein.distance(word, mot, borne)
+            if d > borne:
+                continue
+            if d <= max_dist:
+                resultats.append((d, rangs[noeud], mot))
+            for e in range(a, b):
+                if d - max_dist <= distances[e] <= d + max_dist:
+                    pile.append(cibles[e])
+
+        resultats.sort()
+        return [(mot, d) for d, _, mot in resultats]
+
+    def top_k(self, word, k, max_dist=None):
+        """Les k meilleurs mots (distance, puis ordre du dictionnaire) en un seul parcours"""
+        tas = []  # (-distance, -index, mot) : le pire candidat au sommet
+        if not self.taille or k <= 0:
+            return []
+
+        rangs, debut, cibles, distances = self.rangs, self.debut, self.cibles, self.distances
+        pile = [0]
+        while pile:
+            noeud = pile.pop()
+            a, b = debut[noeud], debut[noeud + 1]
+            mot = self.mot(noeud)
+            # Rayon courant : max_dist, resserré par le pire candidat une fois le tas plein
+            r = float("inf") if max_dist is None else max_dist
+            if len(tas) == k:
+                r = min(r, -tas[0][0])
+            borne = None if r == float("inf") else r + (distances[b - 1] if b > a else 0)
+            d = levenshtein.distance(word, mot, borne)
+            if borne is not None and d > borne:
+                continue
+
+            if d <= r:
+                index = rangs[noeud]
+                if len(tas) < k:
+                    heapq.heappush(tas, (-d, -index, mot))
+                elif (-d, -index) > tas[0][:2]:
+                    heapq.heapreplace(tas, (-d, -index, mot))
+                if len(tas) == k:
+                    r = min(r, -tas[0][0])
+
+            candidats = [(abs(distances[e] - d), cibles[e]) for e in range(a, b) if d - r <= distances[e] <= d + r]
+            candidats.sort(key=lambda c: c[0], reverse=True)
+            pile.extend(enfant for _, enfant in candidats)
+
+        return [(mot, -d) for d, _, mot in sorted(tas, reverse=True)]
+
+
+def main():
+    # Usage : python -m module_IA.bktree Dictionnaire/teny_clean.txt Dictionnaire/teny_clean.bktree
+    #         [Dictionnaire/teny_clean.freq [frequence_min]]
+    if len(sys.argv) not in (3, 4, 5):
+        print("Usage : python -m module_IA.bktree <dictionnaire.txt> <sortie.bktree> [<table.freq> [<frequence_min>]]")
+        sys.exit(1)
+
+    # Mêmes candidats au mot proche que le Dictionnaire : entrées d'un mot, par fréquence s'il y en a
+    from module_IA.frequences import candidats, charger_frequences, signature_candidats
+    mots = levenshtein.charger_mots(sys.argv[1])
+    frequences = charger_frequences(sys.argv[3], mots) if len(sys.argv) > 3 else None
+    if len(sys.argv) > 3 and frequences is None:
+        print(f"❌ {sys.argv[3]} ne correspond pas à {sys.argv[1]}")
+        sys.exit(1)
+    frequence_min = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    signature = signature_candidats(signature_mots(mots), frequences, frequence_min)
+    mots = candidats(mots, frequences, frequence_min)
+    debut = time.perf_counter()
+    arbre = BKTree(mots, signature)
+    print(f"✓ Arbre BK construit : {arbre.taille} mots en {time.perf_counter() - debut:.1f}s")
+    arbre.sauvegarder(sys.argv[2])
+    print(f"✓ Sauvegardé dans {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
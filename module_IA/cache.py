@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache borné (moins récemment utilisé) avec statistiques.
+    Les endpoints synchrones de FastAPI tournent dans plusieurs threads :
+    toutes les opérations passent par un verrou.
+    """
+
+    def __init__(self, taille_max=10000):
+        self.taille_max = taille_max
+        self.entrees = OrderedDict()
+        self.verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, cle, defaut=None):
+        with self.verrou:
+            if cle in self.entrees:
+                self.entrees.move_to_end(cle)
+                self.hits += 1
+                return self.entrees[cle]
+            self.misses += 1
+            return defaut
+
+    def put(self, cle, valeur):
+        if self.taille_max <= 0:
+            return
+        with self.verrou:
+            self.entrees[cle] = valeur
+            self.entrees.move_to_end(cle)
+            while len(self.entrees) > self.taille_max:
+                self.entrees.popitem(last=False)
+                self.evictions += 1
+
+    def supprimer(self, cle):
+        with self.verrou:
+            self.entrees.pop(cle, None)
+
+    def vider(self):
+        with self.verrou:
+            self.entrees.clear()
+
+    def __len__(self):
+        return len(self.entrees)
+
+    def statistiques(self):
+        with self.verrou:
+            total = self.hits + self.misses
+            return {
+                "taille": len(self.entrees),
+                "taille_max": self.taille_max,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "taux_hit": round(self.hits / total, 4) if total else 0.0,
+            }
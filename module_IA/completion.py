@@ -0,0 +1,73 @@
+import heapq
+from bisect import bisect_left
+
+# Plus grand point de code : borne haute de tous les mots commençant par un préfixe
+FIN = "\U0010ffff"
+
+
+class IndexPrefixes:
+    """
+    Complétion par préfixe sur une copie triée et normalisée (casefold) du dictionnaire.
+    Les mots commençant par un préfixe forment une tranche contiguë trouvée par deux
+    recherches dichotomiques. Avec des fréquences, les meilleurs mots de la tranche
+    sont renvoyés en premier ; les tranches de plus de `seuil` mots sont classées
+    à l'avance pour que le coût d'une requête reste borné.
+    """
+
+    def __init__(self, mots, frequences=None, limite_max=50, seuil=64):
+        # Un seul mot par forme normalisée : le premier dans l'ordre du dictionnaire
+        premiers = {}
+        for index, mot in enumerate(mots):
+            premiers.setdefault(mot.casefold(), index)
+        ordre = sorted(premiers)
+
+        self.cles = ordre
+        self.mots = [mots[premiers[cle]] for cle in ordre]
+        self.frequences = None
+        self.limite_max = limite_max
+        self.top = {}
+        if frequences is not None:
+            self.frequences = [frequences[premiers[cle]] for cle in ordre]
+            self.precalculer(seuil)
+
+    def tranche(self, prefixe):
+        p = prefixe.casefold()
+        return bisect_left(self.cles, p), bisect_left(self.cles, p + FIN)
+
+    def classer(self, a, b, limite):
+        """Index des limite mots les plus fréquents de la tranche [a, b)"""
+        freq = self.frequences
+        # A fréquence égale, l'ordre alphabétique départage
+        return heapq.nsmallest(limite, range(a, b), key=lambda i: (-freq[i], i))
+
+    def precalculer(self, seuil):
+        """Classement des préfixes dont la tranche dépasse seuil mots, du plus court au plus long"""
+        a_traiter = [("", 0, len(self.cles))]
+        while a_traiter:
+            p, a, b = a_traiter.pop()
+            self.top[p] = self.classer(a, b, self.limite_max)
+            # Les préfixes d'une lettre de plus découpent la tranche en sous-tranches contiguës
+            i = a
+            n = len(p)
+            while i < b:
+                if len(self.cles[i]) <= n:
+                    i += 1
+                    continue
+                enfant = self.cles[i][:n + 1]
+                ca, cb = self.tranche(enfant)
+                if cb - ca > seuil:
+                    a_traiter.append((enfant, ca, cb))
+                i = cb
+
+    def completer(self, prefixe, limite=10):
+        """Mots commençant par prefixe (insensible à la casse), au plus limite"""
+        a, b = self.tranche(prefixe)
+        if self.frequences is None:
+            return self.mots[a:min(b, a + limite)]
+
+        p = prefixe.casefold()
+        if p in self.top and limite <= self.limite_max:
+            indices = self.top[p][:limite]
+        else:
+            indices = self.classer(a, b, limite)
+        return [self.mots[i] for i in indices]
@@ -0,0 +1,191 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+from module_IA import levenshtein
+from module_IA.bktree import ArbreBKPlat, signature_mots
+from module_IA.phrases import est_phrase
+
+# En-tête : magic, version, nb_mots, nb_cles, signature (sha1) des mots, puis (début, taille) de chaque section
+MAGIC = b"TENY"
+VERSION_FORMAT = 3
+ENTETE = struct.Struct("<4sIII40s" + "QQ" * 7)
+SECTIONS = ("offsets_mots", "mots", "offsets_cles", "cles", "simples", "phrases", "index")
+
+
+def aligner(f):
+    """Aligner la position d'écriture sur 8 octets (lecture directe des uint32)"""
+    reste = f.tell() % 8
+    if reste:
+        f.write(b"\0" * (8 - reste))
+
+
+def ecrire_chaines(chaines):
+    """(offsets uint32, données) pour une liste de chaînes UTF-8 concaténées"""
+    donnees = bytearray()
+    offsets = [0]
+    for chaine in chaines:
+        donnees += chaine
+        offsets.append(len(donnees))
+    return struct.pack(f"<{len(offsets)}I", *offsets), bytes(donnees)
+
+
+def construire(mots, path, index=None):
+    """
+    Écrire le dictionnaire binaire :
+    - les mots dans l'ordre du fichier (départage des distances égales)
+    - les clés en minuscules des entrées d'un mot, triées et uniques (appartenance par
+      recherche dichotomique ; les phrases sont dans le TriePhrases du Dictionnaire)
+    - les numéros des entrées d'un mot et ceux des phrases (phrases.separer sans décoder les mots)
+    - optionnellement un index pré-calculé (arbre BK aplati des candidats au mot proche)
+    La signature des mots est écrite dans l'en-tête : les tables de fréquences et l'arbre
+    se vérifient au chargement sans décoder le dictionnaire.
+    """
+    cles = sorted(set(mot.lower().encode("utf-8") for mot in mots if not est_phrase(mot)))
+    offsets_mots, donnees_mots = ecrire_chaines(mot.encode("utf-8") for mot in mots)
+    offsets_cles, donnees_cles = ecrire_chaines(cles)
+    simples = array("I")
+    phrases = array("I")
+    for i, mot in enumerate(mots):
+        (phrases if est_phrase(mot) else simples).append(i)
+    if sys.byteorder != "little":
+        simples.byteswap()
+        phrases.byteswap()
+    donnees_index = b"" if index is None else index.aplatir()
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * ENTETE.size)
+        positions = []
+        for section in (offsets_mots, donnees_mots, offsets_cles, donnees_cles, simples.tobytes(),
+                        phrases.tobytes(), donnees_index):
+            aligner(f)
+            positions.extend((f.tell(), len(section)))
+            f.write(section)
+        f.seek(0)
+        f.write(ENTETE.pack(MAGIC, VERSION_FORMAT, len(mots), len(cles), signature_mots(mots).encode("ascii"),
+                            *positions))
+    os.replace(tmp, path)
+
+
+class DicoBinaire:
+    """
+    Dictionnaire binaire projeté en mémoire (mmap) et partagé en lecture seule.
+    Au démarrage rien n'est alloué par mot : les offsets sont lus directement dans
+    le tampon et chaque mot n'est décodé qu'au moment où on y accède.
+    Se comporte comme une liste de mots (len, index, itération) et expose contient(),
+    ainsi que les numéros des entrées d'un mot (simples) et des phrases (phrases).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        entete = ENTETE.unpack_from(self.mm, 0)
+        magic, version, self.nb_mots, self.nb_cles, signature = entete[:5]
+        if magic != MAGIC or version != VERSION_FORMAT:
+            raise ValueError(f"Format de dictionnaire binaire invalide : {path}")
+        if sys.byteorder != "little":
+            raise ValueError("Le dictionnaire binaire est stocké en petit-boutiste")
+        self.signature = signature.decode("ascii")
+        self.sections = {
+            nom: (entete[5 + 2 * i], entete[6 + 2 * i]) for i, nom in enumerate(SECTIONS)
+        }
+
+        vue = memoryview(self.mm)
+        debut, taille = self.sections["offsets_mots"]
+        self.offsets_mots = vue[debut:debut + taille].cast("I")
+        debut, taille = self.sections["offsets_cles"]
+        self.offsets_cles = vue[debut:debut + taille].cast("I")
+        debut, taille = self.sections["simples"]
+        self.simples = vue[debut:debut + taille].cast("I")
+        debut, taille = self.sections["phrases"]
+        self.phrases = vue[debut:debut + taille].cast("I")
+        self.debut_mots = self.sections["mots"][0]
+        self.debut_cles = self.sections["cles"][0]
+
+    def __len__(self):
+        return self.nb_mots
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.nb_mots
+        if not 0 <= i < self.nb_mots:
+            raise IndexError(i)
+        a = self.debut_mots + self.offsets_mots[i]
+        b = self.debut_mots + self.offsets_mots[i + 1]
+        return self.mm[a:b].decode("utf-8")
+
+    def __iter__(self):
+        mm, debut, offsets = self.mm, self.debut_mots, self.offsets_mots
+        for i in range(self.nb_mots):
+            yield mm[debut + offsets[i]:debut + offsets[i + 1]].decode("utf-8")
+
+    def __contains__(self, mot):
+        return self.contient(mot)
+
+    def cle(self, i):
+        a = self.debut_cles + self.offsets_cles[i]
+        b = self.debut_cles + self.offsets_cles[i + 1]
+        return self.mm[a:b]
+
+    def contient(self, mot):
+        """Appartenance insensible à la casse par recherche dichotomique dans les clés triées"""
+        cible = mot.lower().encode("utf-8")
+        bas, haut = 0, self.nb_cles
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            if self.cle(milieu) < cible:
+                bas = milieu + 1
+            else:
+                haut = milieu
+        return bas < self.nb_cles and self.cle(bas) == cible
+
+    def index(self):
+        """Arbre BK stocké dans le fichier, lu en place dans le tampon (None s'il n'y en a pas)"""
+        debut, taille = self.sections["index"]
+        if taille == 0:
+            return None
+        return ArbreBKPlat(memoryview(self.mm)[debut:debut + taille])
+
+    def fermer(self):
+        self.offsets_mots.release()
+        self.offsets_cles.release()
+        self.simples.release()
+        self.phrases.release()
+        self.mm.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construire le dictionnaire binaire (mmap)")
+    parser.add_argument("source", help="Dictionnaire texte (un mot par ligne)")
+    parser.add_argument("sortie", help="Fichier binaire à écrire (ex. Dictionnaire/teny_clean.bin)")
+    parser.add_argument("--bktree", action="store_true", help="Ajouter l'arbre BK pré-calculé")
+    parser.add_argument("--frequences", help="Table de fréquences : arbre BK dans l'ordre des fréquences")
+    parser.add_argument("--frequence-min", type=int, default=0, help="Avec --frequences : mots plus rares exclus de l'arbre")
+    args = parser.parse_args()
+
+    mots = levenshtein.charger_mots(args.source)
+    index = None
+    if args.bktree:
+        from module_IA.bktree import BKTree
+        from module_IA.frequences import candidats, charger_frequences, signature_candidats
+        frequences = charger_frequences(args.frequences, mots) if args.frequences else None
+        if args.frequences and frequences is None:
+            parser.error(f"{args.frequences} ne correspond pas à {args.source}")
+        debut = time.perf_counter()
+        index = BKTree(candidats(mots, frequences, args.frequence_min),
+                       signature_candidats(signature_mots(mots), frequences, args.frequence_min))
+        print(f"✓ Arbre BK construit en {time.perf_counter() - debut:.1f}s")
+
+    construire(mots, args.sortie, index)
+    print(f"✓ {len(mots)} mots écrits dans {args.sortie} ({os.path.getsize(args.sortie) / 1e6:.1f} Mo)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import os
+import unicodedata
+
+from module_IA import levenshtein, metriques
+from module_IA.automate import Automate, MoteurAutomate
+from module_IA.bktree import ArbreBKPlat
+from module_IA.cache import CacheLRU
+from module_IA.completion import IndexPrefixes
+from module_IA.dicobin import DicoBinaire
+from module_IA.frequences import candidats, charger_frequences, signature_candidats, signature_dictionnaire
+from module_IA.phrases import TriePhrases, separer
+from module_IA.symspell import SymSpell
+from module_IA.vectorise import LevenshteinNumpy
+
+# Moteurs disponibles pour le calcul du mot proche
+MOTEURS = ("levenshtein", "bktree", "symspell", "numpy", "automate")
+
+
+def normaliser(mot):
+    """Clé de cache : forme Unicode composée, sans espaces autour"""
+    return unicodedata.normalize("NFC", mot.strip())
+
+
+class Dictionnaire:
+    """
+    Service de dictionnaire partagé par les endpoints de l'API.
+    Le fichier est lu une seule fois. Les entrées d'un seul mot servent au calcul du
+    mot proche et à la vérification d'appartenance (en minuscules) ; les entrées de
+    plusieurs mots ("AC Milan") forment un index de phrases à part, mot par mot.
+    La complétion garde toutes les entrées.
+    Avec une table de fréquences (corpus Wikipedia), les suggestions de même distance
+    sont classées du mot le plus fréquent au moins fréquent, et la complétion aussi.
+    """
+
+    def __init__(self, mots, path=None, index=None, moteur="bktree", taille_cache=10000, index_path=None,
+                 frequences=None, frequences_path=None, frequence_min=0):
+        self.path = path
+        self.index_path = index_path
+        self.frequences_path = frequences_path
+        self.frequence_min = frequence_min
+        self.mots = mots
+        # Fréquences alignées sur self.mots (None sans table à jour)
+        self.frequences = frequences
+        # Une phrase n'est jamais le mot proche d'un mot du texte : hors des candidats
+        self.mots_simples, phrases = separer(mots)
+        # Candidats au mot proche : par fréquence décroissante, sans les mots trop rares
+        self.candidats = self.mots_simples if frequences is None else candidats(mots, frequences, frequence_min)
+        self.phrases = TriePhrases(phrases)
+        if isinstance(mots, DicoBinaire):
+            # Dictionnaire binaire : l'appartenance se vérifie directement dans le tampon mmap
+            self.mots_valides = mots
+        else:
+            # Automate minimal : préfixes et suffixes partagés, bien plus compact qu'un set
+            self.mots_valides = Automate(mot.lower() for mot in self.mots_simples)
+        self.comparateur = levenshtein.Levenshtein(mots=self.candidats)
+        # Arbre BK optionnel : mêmes résultats que le parcours linéaire, en beaucoup moins de calculs.
+        # Il est ignoré s'il a été construit pour une autre liste de candidats (autre version
+        # du dictionnaire, autres fréquences ou autre fréquence minimale).
+        if index is not None and index.signature != signature_candidats(signature_dictionnaire(mots), frequences,
+                                                                        frequence_min):
+            index = None
+        self.index = index
+        self.nom_moteur = moteur
+        self.moteur = self.creer_moteur(moteur)
+        # Le cache appartient à ce dictionnaire : un rechargement repart d'un cache vide
+        self.cache = CacheLRU(taille_cache)
+        # Index de complétion construit ici (au démarrage ou dans le thread de rechargement) :
+        # la première requête /complete n'a pas à le construire, ni à se le disputer
+        self.prefixes = IndexPrefixes(self.mots, self.frequences)
+
+    def creer_moteur(self, moteur):
+        """Choisir le moteur qui répond à mot_proche / within"""
+        exact = self.index if self.index is not None else self.comparateur
+        if moteur == "levenshtein":
+            return self.comparateur
+        if moteur == "bktree":
+            # Sans arbre sérialisé à jour on garde le parcours linéaire
+            return exact
+        if moteur == "symspell":
+            return SymSpell(self.candidats, repli=exact)
+        if moteur == "numpy":
+            return LevenshteinNumpy(self.candidats)
+        if moteur == "automate":
+            return MoteurAutomate(self.candidats, repli=exact)
+        raise ValueError(f"Moteur inconnu : {moteur} (choix : {', '.join(MOTEURS)})")
+
+    @classmethod
+    def charger(cls, path, index_path=None, moteur="bktree", taille_cache=10000,
+                frequences_path=None, frequence_min=0):
+        """Construire le service à partir d'un fichier texte (un mot par ligne) ou binaire (.bin)"""
+        if path.endswith(".bin"):
+            mots = DicoBinaire(path)
+            index = mots.index() if moteur in ("bktree", "symspell", "automate") else None
+        else:
+            mots = levenshtein.charger_mots(path)
+            index = None
+            if index_path and os.path.exists(index_path):
+                # Arbre aplati projeté en mémoire (None pour un fichier d'un autre format)
+                index = ArbreBKPlat.charger(index_path)
+
+        frequences = None
+        if frequences_path and os.path.exists(frequences_path):
+            # La table est ignorée si elle a été construite pour une autre version du dictionnaire
+            frequences = charger_frequences(frequences_path, mots)
+        return cls(mots, path=path, index=index, moteur=moteur, taille_cache=taille_cache,
+                   index_path=index_path, frequences=frequences, frequences_path=frequences_path,
+                   frequence_min=frequence_min)
+
+    def __len__(self):
+        """Mots d'une entrée distincts en minuscules, quel que soit le format du fichier"""
+        if isinstance(self.mots_valides, DicoBinaire):
+            return self.mots_valides.nb_cles
+        return len(self.mots_valides)
+
+    def contient(self, mot):
+        """Vérifier si un mot (ou une phrase) appartient au dictionnaire (insensible à la casse)"""
+        cle = mot.lower()
+        if cle in self.mots_valides:
+            return True
+        return " " in cle and cle in self.phrases
+
+    def completer(self, prefixe, limite=10):
+        """Mots du dictionnaire commençant par prefixe"""
+        return self.prefixes.completer(prefixe, limite)
+
+    def mot_proche(self, mot):
+        """Mot le plus proche et sa distance (mémorisé dans le cache LRU)"""
+        cle = normaliser(mot)
+        resultat = self.cache.get(cle)
+        if resultat is None:
+            with metriques.etape("distance"), metriques.mesurer_evaluations("mot_proche"):
+                resultat = self.moteur.mot_proche(cle)
+            self.cache.put(cle, resultat)
+        return resultat
+
+    def mot_proche_lot(self, mots, annulation=None):
+        """
+        Mot proche de chaque mot distinct : {mot: (suggestion, distance)}.
+        Avec annulation (threading.Event), le calcul s'arrête entre deux mots dès qu'elle
+        est levée : le résultat est alors partiel.
+        """
+        resultats = {}
+        manquants = {}
+        for mot in mots:
+            cle = normaliser(mot)
+            resultat = self.cache.get(cle)
+            if resultat is None:
+                manquants.setdefault(cle, []).append(mot)
+            else:
+                resultats[mot] = resultat
+
+        if manquants:
+            with metriques.etape("distance"), metriques.mesurer_evaluations("mot_proche_lot"):
+                calcules = self.calculer_lot(list(manquants), annulation)
+            for cle, resultat in calcules.items():
+                self.cache.put(cle, resultat)
+                for mot in manquants[cle]:
+                    resultats[mot] = resultat
+        return resultats
+
+    def calculer_lot(self, cles, annulation=None):
+        """Mots proches des clés absentes du cache, par le moteur"""
+        if annulation is None and hasattr(self.moteur, "mot_proche_lot"):
+            return self.moteur.mot_proche_lot(cles)
+        # Les index (arbre BK, SymSpell...) répondent déjà sans parcourir tout le dictionnaire ;
+        # mot par mot, une annulation est vue avant chaque nouveau calcul
+        resultats = {}
+        for cle in cles:
+            if annulation is not None and annulation.is_set():
+                break
+            resultats[cle] = self.moteur.mot_proche(cle)
+        return resultats
+
+    def within(self, mot, max_dist):
+        """Mots à distance <= max_dist, triés par distance puis fréquence (ou ordre du dictionnaire)"""
+        with metriques.etape("distance"):
+            return self.moteur.within(mot, max_dist)
+
+    def top_k(self, mot, k, max_dist=None):
+        """Les k mots les plus proches en un seul parcours du dictionnaire ou de l'index"""
+        with metriques.etape("distance"):
+            return self.moteur.top_k(mot, k, max_dist)
+
+    def statistiques(self):
+        stats = {
+            "mots": len(self.mots),
+            "mots_simples": len(self.mots_simples),
+            "candidats": len(self.candidats),
+            "frequences": self.frequences is not None,
+            "phrases": {"entrees": len(self.phrases), "noeuds": self.phrases.nb_noeuds},
+            "moteur": self.nom_moteur,
+            "arbre_bk": self.index is not None,
+            "cache": self.cache.statistiques(),
+        }
+        if isinstance(self.mots_valides, Automate):
+            stats["automate"] = {
+                "noeuds": self.mots_valides.nb_noeuds(),
+                "aretes": len(self.mots_valides.cibles),
+                "memoire_octets": self.mots_valides.memoire(),
+            }
+        if hasattr(self.moteur, "statistiques"):
+            stats["index"] = self.moteur.statistiques()
+        return stats
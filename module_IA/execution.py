@@ -0,0 +1,128 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from module_IA.dictionnaire import Dictionnaire, normaliser
+
+# Dictionnaire propre à chaque processus du pool (chargé une seule fois par processus)
+_dictionnaire = None
+
+
+def initialiser(path, index_path, moteur, frequences_path=None, frequence_min=0):
+    global _dictionnaire
+    # Le cache reste dans le processus principal : pas de cache dans les workers
+    _dictionnaire = Dictionnaire.charger(path, index_path, moteur, taille_cache=0,
+                                         frequences_path=frequences_path, frequence_min=frequence_min)
+
+
+def mot_proche(mot):
+    return _dictionnaire.mot_proche(mot)
+
+
+def pret():
+    return True
+
+
+def mot_proche_lot(mots):
+    return _dictionnaire.mot_proche_lot(mots)
+
+
+class PoolCorrection:
+    """
+    Calcul du mot proche dans un pool de processus, hors de la boucle d'événements.
+    Chaque processus charge le dictionnaire et l'index au démarrage ; les lots de mots
+    sont répartis entre les processus. Le cache LRU du dictionnaire principal est
+    consulté avant tout envoi au pool.
+    Chaque utilisation est encadrée par acquerir() / liberer() : fermer(attendre=True)
+    refuse les nouvelles utilisations et attend la fin de celles en cours.
+    """
+
+    def __init__(self, dictionnaire, nb_workers):
+        self.dictionnaire = dictionnaire
+        self.nb_workers = nb_workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=nb_workers,
+            initializer=initialiser,
+            initargs=(dictionnaire.path, dictionnaire.index_path, dictionnaire.nom_moteur,
+                      dictionnaire.frequences_path, dictionnaire.frequence_min),
+        )
+        self.utilisations = 0
+        self.ferme = False
+        self.libre = threading.Condition()
+
+    def acquerir(self):
+        """Réserver le pool pour un calcul ; False s'il est en cours de fermeture"""
+        with self.libre:
+            if self.ferme:
+                return False
+            self.utilisations += 1
+            return True
+
+    def liberer(self):
+        with self.libre:
+            self.utilisations -= 1
+            if self.utilisations == 0:
+                self.libre.notify_all()
+
+    async def mot_proche(self, mot):
+        cle = normaliser(mot)
+        resultat = self.dictionnaire.cache.get(cle)
+        if resultat is None:
+            loop = asyncio.get_running_loop()
+            resultat = await loop.run_in_executor(self.executor, mot_proche, cle)
+            self.dictionnaire.cache.put(cle, resultat)
+        return resultat
+
+    async def mot_proche_lot(self, mots):
+        resultats = {}
+        manquants = {}
+        for mot in mots:
+            cle = normaliser(mot)
+            resultat = self.dictionnaire.cache.get(cle)
+            if resultat is None:
+                manquants.setdefault(cle, []).append(mot)
+            else:
+                resultats[mot] = resultat
+
+        if manquants:
+            # Une part du lot par processus
+            cles = list(manquants)
+            taille = -(-len(cles) // self.nb_workers)
+            loop = asyncio.get_running_loop()
+            parts = await asyncio.gather(*[
+                loop.run_in_executor(self.executor, mot_proche_lot, cles[i:i + taille])
+                for i in range(0, len(cles), taille)
+            ])
+            for calcules in parts:
+                for cle, resultat in calcules.items():
+                    self.dictionnaire.cache.put(cle, resultat)
+                    for mot in manquants[cle]:
+                        resultats[mot] = resultat
+        return resultats
+
+    def prechauffer(self):
+        """Démarrer les processus (et charger leur dictionnaire) avant la première requête"""
+        for future in [self.executor.submit(pret) for _ in range(self.nb_workers)]:
+            future.result()
+
+    def fermer(self, attendre=False):
+        # attendre=True : les requêtes qui ont acquis le pool finissent leurs calculs
+        # (ancien pool après un rechargement, fermé depuis le thread du Rechargeur)
+        with self.libre:
+            self.ferme = True
+            if attendre:
+                self.libre.wait_for(lambda: self.utilisations == 0)
+        self.executor.shutdown(wait=attendre, cancel_futures=not attendre)
+
+
+class Service:
+    """
+    Ce que les requêtes utilisent ensemble : le dictionnaire (avec son cache) et le pool
+    de correction construit pour lui. Un rechargement remplace le tout par une seule
+    affectation (app.state.service) ; une requête lit le service une fois et garde la
+    même paire jusqu'au bout.
+    """
+
+    def __init__(self, dictionnaire, pool=None):
+        self.dictionnaire = dictionnaire
+        self.pool = pool
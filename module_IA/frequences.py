@@ -0,0 +1,130 @@
+import argparse
+import hashlib
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from collections import Counter
+
+from module_IA import levenshtein
+from module_IA.bktree import signature_mots
+from module_IA.phrases import SousListe, est_phrase, separer
+
+# Même découpage en mots que la vérification orthographique (RE_MOT de l'API)
+RE_MOT = re.compile(r"\b[a-zA-Zà-ÿÀ-Ÿ-]+\b")
+
+# En-tête : magic, version, nombre d'entrées, signature (sha1) du dictionnaire
+MAGIC = b"FREQ"
+VERSION_FORMAT = 1
+ENTETE = struct.Struct("<4sII40s")
+MAX_COMPTE = 2 ** 32 - 1
+
+
+def compter(lignes):
+    """Nombre d'occurrences de chaque mot (en minuscules) dans les lignes d'un corpus"""
+    compteur = Counter()
+    for ligne in lignes:
+        compteur.update(mot.lower() for mot in RE_MOT.findall(ligne))
+    return compteur
+
+
+def construire_table(mots, compteur):
+    """
+    Fréquences alignées sur les entrées du dictionnaire (uint32, même ordre que le
+    fichier). Une phrase ("AC Milan") n'a pas de fréquence propre : 0.
+    """
+    return array("I", (0 if est_phrase(mot) else min(compteur.get(mot.lower(), 0), MAX_COMPTE)
+                       for mot in mots))
+
+
+def signature_dictionnaire(mots):
+    """Signature de la liste des entrées ; celle d'un DicoBinaire est lue dans son en-tête"""
+    signature = getattr(mots, "signature", None)
+    return signature if signature is not None else signature_mots(mots)
+
+
+def signature_candidats(signature_dico, frequences=None, frequence_min=0):
+    """
+    Empreinte de la liste des candidats au mot proche, pour reconnaître un arbre BK
+    périmé. Les candidats ne dépendent que des entrées du dictionnaire, de la table de
+    fréquences et de frequence_min : l'empreinte se calcule sans décoder les mots.
+    """
+    h = hashlib.sha1(signature_dico.encode("ascii"))
+    if frequences is not None:
+        h.update(b"\nfrequences\n")
+        h.update(frequences.tobytes())
+        h.update(str(frequence_min).encode("ascii"))
+    return h.hexdigest()
+
+
+def sauvegarder(path, mots, table):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(ENTETE.pack(MAGIC, VERSION_FORMAT, len(table), signature_dictionnaire(mots).encode("ascii")))
+        table.tofile(f)
+    os.replace(tmp, path)
+
+
+def charger_frequences(path, mots):
+    """Table de fréquences ; None si elle a été construite pour une autre version du dictionnaire"""
+    with open(path, "rb") as f:
+        magic, version, nb_mots, signature = ENTETE.unpack(f.read(ENTETE.size))
+        if magic != MAGIC or version != VERSION_FORMAT or nb_mots != len(mots):
+            return None
+        if signature.decode("ascii") != signature_dictionnaire(mots):
+            return None
+        table = array("I")
+        table.fromfile(f, nb_mots)
+    if sys.byteorder != "little":
+        table.byteswap()
+    return table
+
+
+def candidats(mots, frequences=None, frequence_min=0):
+    """
+    Entrées d'un mot candidates au mot proche. Avec des fréquences, elles sont rangées
+    de la plus fréquente à la moins fréquente (ordre du fichier à égalité) : les moteurs
+    départagent les distances égales par la position, ce qui donne le classement
+    (distance, -fréquence), et les mots fréquents, vus en premier, resserrent tout de
+    suite la borne du parcours. Les mots vus moins de frequence_min fois sont écartés.
+    """
+    if frequences is None:
+        return separer(mots)[0]
+    if hasattr(mots, "simples"):
+        # DicoBinaire : numéros des entrées d'un mot lus dans le fichier, sans décoder les mots
+        positions = [i for i in mots.simples if frequences[i] >= frequence_min]
+    else:
+        positions = [i for i, mot in enumerate(mots) if frequences[i] >= frequence_min and not est_phrase(mot)]
+    positions.sort(key=lambda i: -frequences[i])
+    if isinstance(mots, list):
+        return [mots[i] for i in positions]
+    return SousListe(mots, array("I", positions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construire la table de fréquences du dictionnaire")
+    parser.add_argument("dictionnaire", help="Dictionnaire texte (un mot par ligne)")
+    parser.add_argument("corpus", nargs="+", help="Texte des paragraphes (python Scraping/scraping.py --corpus)")
+    parser.add_argument("-o", "--sortie", required=True, help="Table à écrire (ex. Dictionnaire/teny_clean.freq)")
+    args = parser.parse_args()
+
+    mots = levenshtein.charger_mots(args.dictionnaire)
+    debut = time.perf_counter()
+    compteur = Counter()
+    for path in args.corpus:
+        with open(path, "r", encoding="utf-8") as f:
+            compteur.update(compter(f))
+    table = construire_table(mots, compteur)
+    sauvegarder(args.sortie, mots, table)
+
+    vus = sum(1 for n in table if n)
+    print(f"✓ {sum(compteur.values())} mots de corpus, {len(compteur)} formes distinctes "
+          f"en {time.perf_counter() - debut:.1f}s")
+    print(f"✓ {vus}/{len(table)} entrées vues dans le corpus, table écrite dans {args.sortie} "
+          f"({os.path.getsize(args.sortie) / 1e3:.0f} Ko)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import hashlib
+
+from module_IA import metriques
+from module_IA.cache import CacheLRU
+
+
+def hash_paragraphe(texte):
+    """Empreinte courte d'un paragraphe (identifiant côté client et clé de cache)"""
+    return hashlib.blake2b(texte.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class ParagrapheInconnu(KeyError):
+    """Le client a envoyé l'empreinte d'un paragraphe que la session ne connaît pas"""
+
+
+def appliquer_edition(paragraphes, edition):
+    """
+    Appliquer une édition reçue du client à la liste des paragraphes (modifiée sur place).
+    - {"text": t} sans "index" : remplace tout le document
+    - {"index": i, "text": t} : remplace le paragraphe i (ou l'ajoute si i == nombre de paragraphes)
+    - {"index": i, "delete": true} : supprime le paragraphe i
+    """
+    index = edition.get("index")
+    if index is None:
+        paragraphes[:] = (edition.get("text") or "").split("\n")
+        return
+    if not isinstance(index, int) or not 0 <= index <= len(paragraphes):
+        raise IndexError(f"Paragraphe hors limites : {index}")
+    if edition.get("delete"):
+        if index < len(paragraphes):
+            del paragraphes[index]
+    elif index == len(paragraphes):
+        paragraphes.append(edition.get("text") or "")
+    else:
+        paragraphes[index] = edition.get("text") or ""
+
+
+class VerificateurIncremental:
+    """
+    Vérification orthographique paragraphe par paragraphe avec cache par session.
+    Seuls les paragraphes nouveaux ou modifiés sont découpés en mots et comparés au
+    dictionnaire ; les autres sont repris du cache de la session avec leurs positions.
+    Les positions renvoyées sont des index de caractères dans le texte complet,
+    les paragraphes étant séparés par un saut de ligne.
+    Les mots d'une phrase du dictionnaire ("AC Milan") ne sont pas signalés.
+    Avec un vérificateur de règles (MalagasySpellChecker), les violations des règles
+    orthographiques sont aussi calculées à la demande et mémorisées par paragraphe.
+    """
+
+    def __init__(self, re_mot, taille_sessions=1000, taille_paragraphes=5000, regles=None):
+        self.re_mot = re_mot
+        self.regles = regles
+        self.taille_paragraphes = taille_paragraphes
+        # session_id -> (dictionnaire utilisé, CacheLRU hash -> [longueur, mots inconnus, violations])
+        self.sessions = CacheLRU(taille_sessions)
+
+    def verifier_paragraphe(self, dictionnaire, texte):
+        """Mots inconnus d'un paragraphe : [(mot, début, fin)] relatifs au paragraphe"""
+        with metriques.etape("tokenisation"):
+            mots = [(m.group(), m.start(), m.end()) for m in self.re_mot.finditer(texte)]
+        with metriques.etape("recherche"):
+            couverts = self.mots_phrases(dictionnaire, texte, mots)
+            # Ignorer les mots très courts (1 lettre), ceux d'une phrase du dico ou s'ils sont dans le dico
+            return [
+                (mot, d, f) for i, (mot, d, f) in enumerate(mots)
+                if len(mot) > 1 and i not in couverts and not dictionnaire.contient(mot)
+            ]
+
+    @staticmethod
+    def mots_phrases(dictionnaire, texte, mots):
+        """
+        Positions des mots qui font partie d'une phrase du dictionnaire ("AC Milan").
+        Une phrase ne se reconnaît que sur des mots séparés par des espaces : le
+        paragraphe est découpé en suites de mots à chaque ponctuation.
+        """
+        if not len(dictionnaire.phrases):
+            return set()
+        couverts = set()
+        debut = 0
+        for i in range(1, len(mots) + 1):
+            if i == len(mots) or texte[mots[i - 1][2]:mots[i][1]].strip():
+                suite = [mot.lower() for mot, _, _ in mots[debut:i]]
+                couverts.update(debut + j for j in dictionnaire.phrases.couverts(suite))
+                debut = i
+        return couverts
+
+    def vider(self):
+        """Oublier toutes les sessions (après un rechargement : elles retiennent l'ancien dictionnaire)"""
+        self.sessions.vider()
+
+    def cache_session(self, dictionnaire, session_id):
+        session = self.sessions.get(session_id)
+        # Un nouveau dictionnaire invalide les résultats mémorisés
+        if session is None or session[0] is not dictionnaire:
+            session = (dictionnaire, CacheLRU(self.taille_paragraphes))
+            self.sessions.put(session_id, session)
+        return session[1]
+
+    def verifier(self, dictionnaire, paragraphes, session_id=None, regles=False):
+        """
+        paragraphes : liste de (texte, hash) où l'un des deux peut être None.
+        Un paragraphe envoyé seulement par son hash doit être connu de la session.
+        Avec regles=True, la réponse contient aussi les violations des règles orthographiques.
+        """
+        regles = regles and self.regles is not None
+        cache = self.cache_session(dictionnaire, session_id) if session_id else None
+        tokens = []
+        violations = []
+        empreintes = []
+        reverifies = 0
+        debut = 0
+
+        for texte, empreinte in paragraphes:
+            if texte is not None:
+                empreinte = hash_paragraphe(texte)
+            resultat = cache.get(empreinte) if cache is not None else None
+            if resultat is None:
+                if texte is None:
+                    raise ParagrapheInconnu(empreinte)
+                resultat = [len(texte), self.verifier_paragraphe(dictionnaire, texte), None]
+                reverifies += 1
+                if cache is not None:
+                    cache.put(empreinte, resultat)
+            if regles and resultat[2] is None:
+                # Paragraphe connu seulement par son hash et jamais passé aux règles
+                if texte is None:
+                    raise ParagrapheInconnu(empreinte)
+                with metriques.etape("regles"):
+                    resultat[2] = self.regles.find_violations(texte)
+
+            longueur, inconnus, regles_paragraphe = resultat
+            for mot, d, f in inconnus:
+                tokens.append({"word": mot, "start": debut + d, "end": debut + f})
+            if regles:
+                for v in regles_paragraphe:
+                    violations.append({
+                        "rule": v.rule, "word": v.word, "detail": v.detail,
+                        "start": debut + v.start, "end": debut + v.end,
+                    })
+            empreintes.append(empreinte)
+            # +1 pour le saut de ligne qui sépare les paragraphes
+            debut += longueur + 1
+
+        reponse = {
+            "unknown": list(dict.fromkeys(t["word"] for t in tokens)),
+            "tokens": tokens,
+            "paragraphs": empreintes,
+            "rechecked": reverifies,
+        }
+        if regles:
+            reponse["violations"] = violations
+        return reponse
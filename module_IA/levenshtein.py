@@ -1,50 +1,150 @@
-class Levenshtein:
-    def __init__(self,lienDico):
-        self.dico=self.charger_dico(lienDico)
+import heapq
+
+from module_IA import metriques
 
-    # Alogirthme De Levenshtein
-    def levenshtein(self,a: str, b: str) -> int:
-        n, m = len(a), len(b)
 
-        # Création de la matrice (n+1) x (m+1)
-        dp = [[0] * (m + 1) for _ in range(n + 1)]
+#Chargement des mots d'un fichier (un mot par ligne)
+def charger_mots(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
 
-        # Initialisation
-        for i in range(n + 1):
-            dp[i][0] = i
-        for j in range(m + 1):
-            dp[0][j] = j
 
-        # Remplissage
-        for i in range(1, n + 1):
-            for j in range(1, m + 1):
-                cost = 0 if a[i - 1] == b[j - 1] else 1
-                dp[i][j] = min(
-                    dp[i - 1][j] + 1,        # suppression
-                    dp[i][j - 1] + 1,        # insertion
-                    dp[i - 1][j - 1] + cost  # substitution
-                )
+# Alogirthme De Levenshtein (deux lignes, arrêt anticipé)
+def distance(a: str, b: str, max_dist=None) -> int:
+    """
+    Distance de Levenshtein entre a et b.
+    Avec max_dist, le calcul s'arrête dès que toute une ligne dépasse la borne :
+    la valeur renvoyée est alors max_dist + 1 (seules les distances <= max_dist sont exactes).
+    """
+    n, m = len(a), len(b)
+    if max_dist is not None and abs(n - m) > max_dist:
+        return max_dist + 1
 
-        return dp[n][m]
+    # Seules la ligne précédente et la ligne courante sont conservées
+    prec = list(range(m + 1))
+    for i in range(1, n + 1):
+        ca = a[i - 1]
+        cour = [i] * (m + 1)
+        gauche = i
+        for j in range(1, m + 1):
+            diag = prec[j - 1] if ca == b[j - 1] else prec[j - 1] + 1
+            haut = prec[j] + 1        # suppression
+            gauche += 1               # insertion
+            if haut < gauche:
+                gauche = haut
+            if diag < gauche:
+                gauche = diag         # substitution
+            cour[j] = gauche
+
+        if max_dist is not None and min(cour) > max_dist:
+            return max_dist + 1
+        prec = cour
+
+    return prec[m]
+
+
+class Levenshtein:
+    def __init__(self,lienDico=None,mots=None):
+        # On peut fournir une liste deja chargee pour eviter de relire le fichier
+        self.dico=mots if mots is not None else self.charger_dico(lienDico)
+
+    # Alogirthme De Levenshtein
+    def levenshtein(self,a: str, b: str, max_dist=None) -> int:
+        return distance(a, b, max_dist)
 
 
     #Chargement des mots dans le Dictionnaire
     def charger_dico(self,path):
-        with open(path, "r", encoding="utf-8") as f:
-            return [line.strip() for line in f if line.strip()]
+        return charger_mots(path)
     
     def mot_proche(self,word):
         best_word = None
         best_dist = float("inf")
 
+        n = len(word)
+        evaluations = 0
+
         for w in self.dico:
-            d = self.levenshtein(word, w)
+            # La différence de longueur est une borne inférieure de la distance
+            if abs(len(w) - n) >= best_dist:
+                continue
+            # Seules les distances strictement meilleures nous intéressent
+            d = distance(word, w, None if best_word is None else best_dist - 1)
+            evaluations += 1
             if d < best_dist:
                 best_dist = d
                 best_word = w
+                if d == 0:
+                    break
 
+        metriques.compter_evaluations(evaluations)
         return best_word, best_dist
 
+    def mot_proche_lot(self,words):
+        # Un seul parcours du dictionnaire pour toutes les requêtes (doublons fusionnés)
+        best = {q: [None, float("inf")] for q in words}
+        restantes = list(best)
+        evaluations = 0
+
+        for w in self.dico:
+            if not restantes:
+                break
+            lw = len(w)
+            for q in restantes:
+                b = best[q]
+                if abs(lw - len(q)) >= b[1]:
+                    continue
+                d = distance(q, w, None if b[0] is None else b[1] - 1)
+                evaluations += 1
+                if d < b[1]:
+                    b[0], b[1] = w, d
+                    if d == 0:
+                        # Mot exact : inutile de continuer pour cette requête
+                        restantes = [r for r in restantes if r != q]
+
+        metriques.compter_evaluations(evaluations)
+        return {q: (b[0], b[1]) for q, b in best.items()}
+
+    def within(self,word,max_dist):
+        resultats = []
+        n = len(word)
+        for w in self.dico:
+            if abs(len(w) - n) > max_dist:
+                continue
+            d = distance(word, w, max_dist)
+            if d <= max_dist:
+                resultats.append((w, d))
+
+        # Tri stable : a distance egale on garde l'ordre du dictionnaire
+        resultats.sort(key=lambda r: r[1])
+        return resultats
+
+    def top_k(self,word,k,max_dist=None):
+        # Tas borné de taille k : le pire candidat gardé est au sommet
+        tas = []
+        borne = max_dist
+        n = len(word)
+
+        for index, w in enumerate(self.dico):
+            if borne is not None and abs(len(w) - n) > borne:
+                continue
+            d = distance(word, w, borne)
+            if borne is not None and d > borne:
+                continue
+            if len(tas) < k:
+                heapq.heappush(tas, (-d, -index, w))
+            else:
+                heapq.heappushpop(tas, (-d, -index, w))
+
+            if len(tas) == k:
+                # Les mots suivants ont un index plus grand : il faut faire strictement mieux
+                pire = -tas[0][0] - 1
+                if pire < 0:
+                    break
+                borne = pire if borne is None else min(borne, pire)
+
+        return [(w, -d) for d, _, w in sorted(tas, reverse=True)]
+
 
 if __name__=="__main__":
     a="Mère"
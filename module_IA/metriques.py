@@ -0,0 +1,257 @@
+import contextvars
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+from module_IA.cache import CacheLRU
+
+# Bornes des histogrammes (format d'exposition Prometheus : buckets cumulés "le")
+BUCKETS_DUREE = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BUCKETS_EVALUATIONS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+def echapper(valeur):
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def formater_labels(noms, valeurs, extra=None):
+    paires = list(zip(noms, valeurs))
+    if extra:
+        paires.append(extra)
+    if not paires:
+        return ""
+    return "{" + ",".join(f'{nom}="{echapper(valeur)}"' for nom, valeur in paires) + "}"
+
+
+class Compteur:
+    def __init__(self, nom, aide, labels=()):
+        self.nom = nom
+        self.aide = aide
+        self.labels = labels
+        self.valeurs = {}
+        self.verrou = threading.Lock()
+
+    def inc(self, valeur=1, *labels):
+        with self.verrou:
+            self.valeurs[labels] = self.valeurs.get(labels, 0) + valeur
+
+    def exposer(self):
+        lignes = [f"# HELP {self.nom} {self.aide}", f"# TYPE {self.nom} counter"]
+        with self.verrou:
+            for labels, valeur in sorted(self.valeurs.items()):
+                lignes.append(f"{self.nom}{formater_labels(self.labels, labels)} {valeur}")
+        return lignes
+
+
+class Histogramme:
+    def __init__(self, nom, aide, buckets, labels=()):
+        self.nom = nom
+        self.aide = aide
+        self.buckets = buckets
+        self.labels = labels
+        # valeurs des labels -> [compte par bucket (+Inf en dernier), somme]
+        self.series = {}
+        self.verrou = threading.Lock()
+
+    def observer(self, valeur, *labels):
+        with self.verrou:
+            serie = self.series.get(labels)
+            if serie is None:
+                serie = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            i = 0
+            while i < len(self.buckets) and valeur > self.buckets[i]:
+                i += 1
+            serie[0][i] += 1
+            serie[1] += valeur
+
+    def exposer(self):
+        lignes = [f"# HELP {self.nom} {self.aide}", f"# TYPE {self.nom} histogram"]
+        with self.verrou:
+            for labels, (comptes, somme) in sorted(self.series.items()):
+                cumul = 0
+                for borne, compte in zip(self.buckets + ("+Inf",), comptes):
+                    cumul += compte
+                    le = borne if borne == "+Inf" else repr(float(borne))
+                    lignes.append(f"{self.nom}_bucket{formater_labels(self.labels, labels, ('le', le))} {cumul}")
+                lignes.append(f"{self.nom}_sum{formater_labels(self.labels, labels)} {somme}")
+                lignes.append(f"{self.nom}_count{formater_labels(self.labels, labels)} {cumul}")
+        return lignes
+
+
+class Registre:
+    """
+    Métriques du processus. Les collecteurs sont appelés à chaque lecture de /metrics
+    pour exposer des valeurs tenues ailleurs (ex. statistiques du cache LRU) :
+    ils renvoient des lignes au format d'exposition texte.
+    """
+
+    def __init__(self):
+        self.metriques = []
+        self.collecteurs = []
+
+    def compteur(self, nom, aide, labels=()):
+        metrique = Compteur(nom, aide, labels)
+        self.metriques.append(metrique)
+        return metrique
+
+    def histogramme(self, nom, aide, buckets=BUCKETS_DUREE, labels=()):
+        metrique = Histogramme(nom, aide, buckets, labels)
+        self.metriques.append(metrique)
+        return metrique
+
+    def exposer(self):
+        lignes = []
+        for metrique in self.metriques:
+            lignes.extend(metrique.exposer())
+        for collecteur in self.collecteurs:
+            lignes.extend(collecteur())
+        return "\n".join(lignes) + "\n"
+
+
+REGISTRE = Registre()
+DUREE_REQUETES = REGISTRE.histogramme(
+    "teny_requete_duree_secondes", "Durée des requêtes HTTP par route", labels=("methode", "route", "statut"))
+DUREE_ETAPES = REGISTRE.histogramme(
+    "teny_etape_duree_secondes", "Durée des étapes internes (chargement, tokenisation, recherche, distance)",
+    labels=("etape",))
+EVALUATIONS_REQUETE = REGISTRE.histogramme(
+    "teny_evaluations_dp", "Calculs de distance (programmation dynamique) par requête de mot proche",
+    BUCKETS_EVALUATIONS, labels=("operation",))
+EVALUATIONS_TOTAL = REGISTRE.compteur(
+    "teny_evaluations_dp_total", "Calculs de distance (programmation dynamique) effectués")
+
+# Compteur d'évaluations du thread courant : les moteurs l'incrémentent une fois par requête
+local_thread = threading.local()
+
+
+def compter_evaluations(n):
+    local_thread.evaluations = getattr(local_thread, "evaluations", 0) + n
+    EVALUATIONS_TOTAL.inc(n)
+
+
+def evaluations_courantes():
+    return getattr(local_thread, "evaluations", 0)
+
+
+@contextmanager
+def etape(nom):
+    """
+    Chronométrer une étape. Avec un profileur pour la requête, le thread n'est suivi que
+    pendant le bloc : un thread du pool réutilisé ensuite par une autre requête, ou
+    inactif, n'apparaît pas dans le profil.
+    """
+    profil = PROFIL_COURANT.get()
+    thread_id = threading.get_ident()
+    if profil is not None:
+        profil.suivre(thread_id)
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        DUREE_ETAPES.observer(time.perf_counter() - debut, nom)
+        if profil is not None:
+            profil.oublier(thread_id)
+
+
+@contextmanager
+def mesurer_evaluations(operation):
+    """Observer le nombre de calculs de distance faits dans le bloc (thread courant)"""
+    avant = evaluations_courantes()
+    try:
+        yield
+    finally:
+        EVALUATIONS_REQUETE.observer(evaluations_courantes() - avant, operation)
+
+
+def collecteur_cache(source):
+    """Collecteur des statistiques d'un CacheLRU ; source() renvoie le cache courant (ou None)"""
+    def collecter():
+        cache = source()
+        if cache is None:
+            return []
+        stats = cache.statistiques()
+        return [
+            "# HELP teny_cache_requetes_total Lectures du cache des mots proches",
+            "# TYPE teny_cache_requetes_total counter",
+            f'teny_cache_requetes_total{{resultat="hit"}} {stats["hits"]}',
+            f'teny_cache_requetes_total{{resultat="miss"}} {stats["misses"]}',
+            "# HELP teny_cache_evictions_total Entrées évincées du cache des mots proches",
+            "# TYPE teny_cache_evictions_total counter",
+            f"teny_cache_evictions_total {stats['evictions']}",
+            "# HELP teny_cache_entrees Entrées dans le cache des mots proches",
+            "# TYPE teny_cache_entrees gauge",
+            f"teny_cache_entrees {stats['taille']}",
+            "# HELP teny_cache_taux_hit Proportion de lectures servies par le cache",
+            "# TYPE teny_cache_taux_hit gauge",
+            f"teny_cache_taux_hit {stats['taux_hit']}",
+        ]
+    return collecter
+
+
+#######################################################################
+# Profileur par échantillonnage, activé requête par requête
+
+PROFIL_COURANT = contextvars.ContextVar("profil_courant", default=None)
+PROFILS = CacheLRU(20)
+
+
+class ProfilEchantillonnage:
+    """
+    Toutes les `intervalle` secondes, un thread relève la pile des threads qui
+    travaillent pour la requête, c'est-à-dire qui sont dans un bloc etape() de celle-ci
+    (la boucle d'événements n'est pas relevée : elle sert toutes les requêtes).
+    Le résultat est au format "pile repliée" (une ligne "f1;f2;f3 n"), lisible
+    par flamegraph.pl ou speedscope.
+    """
+
+    def __init__(self, intervalle=0.005):
+        self.id = uuid.uuid4().hex[:12]
+        self.intervalle = intervalle
+        # thread -> nombre de blocs etape() ouverts (les étapes peuvent s'imbriquer)
+        self.threads = Counter()
+        self.echantillons = Counter()
+        self.arret = threading.Event()
+        self.thread = threading.Thread(target=self.echantillonner, daemon=True)
+        self.duree = 0.0
+
+    def suivre(self, thread_id):
+        self.threads[thread_id] += 1
+
+    def oublier(self, thread_id):
+        self.threads[thread_id] -= 1
+        if self.threads[thread_id] <= 0:
+            del self.threads[thread_id]
+
+    def demarrer(self):
+        self.debut = time.perf_counter()
+        self.thread.start()
+
+    def arreter(self):
+        self.arret.set()
+        self.thread.join()
+        self.duree = time.perf_counter() - self.debut
+
+    def echantillonner(self):
+        while not self.arret.wait(self.intervalle):
+            frames = sys._current_frames()
+            for thread_id in list(self.threads):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.echantillons[self.pile(frame)] += 1
+
+    @staticmethod
+    def pile(frame):
+        noms = []
+        while frame is not None:
+            code = frame.f_code
+            noms.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(noms))
+
+    def replie(self):
+        lignes = [f"{pile} {n}" for pile, n in self.echantillons.most_common()]
+        return "\n".join(lignes) + "\n"
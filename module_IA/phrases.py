@@ -0,0 +1,128 @@
+from array import array
+
+# Clé de fin de phrase dans les noeuds du trie (jamais un mot : les mots ne sont pas vides)
+FIN = ""
+
+
+def est_phrase(entree):
+    """Entrée de plusieurs mots (ex. "AC Milan")"""
+    return len(entree.split()) > 1
+
+
+class SousListe:
+    """
+    Vue d'une partie d'une liste de mots (ex. DicoBinaire) : seuls les numéros des
+    entrées gardées sont stockés (4 octets par mot), les mots restent dans la source.
+    """
+
+    def __init__(self, mots, indices):
+        self.source = mots
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        return self.source[self.indices[i]]
+
+    def __iter__(self):
+        source = self.source
+        for i in self.indices:
+            yield source[i]
+
+
+def separer(mots):
+    """
+    (mots simples, phrases) dans l'ordre du dictionnaire. Les mots simples servent à
+    l'appartenance et au calcul du mot proche ; les phrases vont dans le TriePhrases.
+    Un DicoBinaire porte ce découpage (numéros des entrées) : seules les phrases sont décodées.
+    """
+    if isinstance(mots, list):
+        simples = []
+        phrases = []
+        for mot in mots:
+            (phrases if est_phrase(mot) else simples).append(mot)
+        return simples, phrases
+
+    if hasattr(mots, "simples"):
+        return SousListe(mots, mots.simples), [mots[i] for i in mots.phrases]
+
+    indices = array("I")
+    phrases = []
+    for i, mot in enumerate(mots):
+        if est_phrase(mot):
+            phrases.append(mot)
+        else:
+            indices.append(i)
+    return SousListe(mots, indices), phrases
+
+
+class TriePhrases:
+    """
+    Trie des entrées de plusieurs mots, mot par mot et en minuscules :
+    {"ac": {"milan": {"": True}}}. Dans un texte, on cherche à chaque position la plus
+    longue suite de mots qui forme une entrée ; ses mots ne sont alors pas inconnus.
+    """
+
+    def __init__(self, phrases=()):
+        self.racine = {}
+        self.nb_phrases = 0
+        self.nb_noeuds = 0
+        for phrase in phrases:
+            self.ajouter(phrase)
+
+    def ajouter(self, phrase):
+        mots = phrase.lower().split()
+        if len(mots) < 2:
+            return
+        noeud = self.racine
+        for mot in mots:
+            enfant = noeud.get(mot)
+            if enfant is None:
+                enfant = noeud[mot] = {}
+                self.nb_noeuds += 1
+            noeud = enfant
+        if FIN not in noeud:
+            noeud[FIN] = True
+            self.nb_phrases += 1
+
+    def __len__(self):
+        return self.nb_phrases
+
+    def __contains__(self, phrase):
+        noeud = self.racine
+        for mot in phrase.lower().split():
+            noeud = noeud.get(mot)
+            if noeud is None:
+                return False
+        return FIN in noeud
+
+    def plus_longue(self, mots, i):
+        """Nombre de mots de la plus longue phrase qui commence à mots[i] (0 si aucune)"""
+        noeud = self.racine
+        longueur = 0
+        for j in range(i, len(mots)):
+            noeud = noeud.get(mots[j])
+            if noeud is None:
+                break
+            if FIN in noeud:
+                longueur = j - i + 1
+        return longueur
+
+    def couverts(self, mots):
+        """
+        Positions des mots (en minuscules) couverts par une phrase, de gauche à droite
+        en prenant à chaque fois la correspondance la plus longue.
+        """
+        positions = set()
+        if not self.racine:
+            return positions
+        i = 0
+        while i < len(mots):
+            longueur = self.plus_longue(mots, i) if mots[i] in self.racine else 0
+            if longueur:
+                positions.update(range(i, i + longueur))
+                i += longueur
+            else:
+                i += 1
+        return positions
@@ -0,0 +1,172 @@
+import gc
+import os
+import threading
+import time
+
+from module_IA import metriques
+
+try:
+    import watchfiles
+except ImportError:  # surveillance par relevé périodique des fichiers
+    watchfiles = None
+
+RECHARGEMENTS = metriques.REGISTRE.compteur(
+    "teny_rechargements_total", "Rechargements du dictionnaire à chaud", labels=("resultat",))
+
+
+def memoire_rss():
+    """Mémoire résidente du processus en octets (None hors Linux)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def empreinte_fichiers(chemins):
+    """(date de modification, taille) de chaque fichier, None s'il n'existe pas"""
+    empreintes = []
+    for chemin in chemins:
+        try:
+            st = os.stat(chemin)
+        except FileNotFoundError:
+            empreintes.append(None)
+        else:
+            empreintes.append((st.st_mtime_ns, st.st_size))
+    return tuple(empreintes)
+
+
+class Rechargeur:
+    """
+    Rechargement du dictionnaire sans redémarrer l'API.
+    construire() fabrique un nouveau service (automate, index, moteur, cache vide) dans
+    un thread d'arrière-plan, pendant que l'ancien continue de répondre ; installer(nouveau)
+    le met en place par une simple affectation (app.state.service : dictionnaire et pool
+    ensemble). Les requêtes en cours gardent la référence qu'elles ont déjà lue et
+    finissent sur l'ancien dictionnaire, libéré dès que plus rien ne l'utilise.
+    Un seul rechargement à la fois : une demande pendant un rechargement en relance un
+    autre à la fin (le fichier a pu changer après sa lecture). En cas d'erreur, l'ancien
+    dictionnaire reste en place, que l'erreur vienne de construire() ou d'installer().
+    """
+
+    def __init__(self, construire, installer, chemins=(), intervalle=2.0):
+        self.construire = construire
+        self.installer = installer
+        self.chemins = [os.path.abspath(c) for c in chemins]
+        self.intervalle = intervalle
+        self.verrou = threading.Lock()
+        self.en_cours = False
+        self.a_refaire = None
+        self.termine = threading.Event()
+        self.termine.set()
+        # Rapport du dernier rechargement (durée, mémoire, erreur éventuelle)
+        self.dernier = None
+        self.arret = threading.Event()
+        self.surveillance = None
+
+    def demander(self, raison="manuel"):
+        """Lancer un rechargement en arrière-plan ; False s'il y en a déjà un (il sera refait ensuite)"""
+        with self.verrou:
+            if self.en_cours:
+                self.a_refaire = raison
+                return False
+            self.en_cours = True
+            self.termine.clear()
+        threading.Thread(target=self.executer, args=(raison,), daemon=True).start()
+        return True
+
+    def executer(self, raison):
+        try:
+            while raison is not None:
+                self.recharger(raison)
+                with self.verrou:
+                    raison, self.a_refaire = self.a_refaire, None
+                    if raison is None:
+                        self.terminer()
+        finally:
+            if raison is not None:
+                # Erreur imprévue : les demandes suivantes et ceux qui attendent ne restent pas bloqués
+                with self.verrou:
+                    self.terminer()
+
+    def terminer(self):
+        # Appelé sous self.verrou
+        self.en_cours = False
+        self.a_refaire = None
+        self.termine.set()
+
+    def recharger(self, raison):
+        """
+        Reconstruire puis basculer. Mémoire résidente relevée avant, au moment où les deux
+        dictionnaires coexistent (chevauchement), et après la bascule. L'allocateur de
+        Python ne rend pas toujours la mémoire au système : "apres" peut rester haut.
+        """
+        rapport = {"raison": raison, "date": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        rss_avant = memoire_rss()
+        debut = time.perf_counter()
+        etape = "construction"
+        try:
+            with metriques.etape("rechargement"):
+                nouveau = self.construire()
+            duree = time.perf_counter() - debut
+            rss_pendant = memoire_rss()
+            # Installation : la bascule elle-même, plus ce que fait installer() autour (ex. pool de processus)
+            etape = "installation"
+            debut_installation = time.perf_counter()
+            self.installer(nouveau)
+            duree_installation = time.perf_counter() - debut_installation
+        except Exception as e:
+            RECHARGEMENTS.inc(1, "erreur")
+            rapport.update(statut="erreur", etape=etape, erreur=f"{type(e).__name__}: {e}",
+                           duree_s=round(time.perf_counter() - debut, 3))
+            self.dernier = rapport
+            print(f"❌ Rechargement du dictionnaire impossible ({etape}) : {e}")
+            return
+
+        mots = len(nouveau)
+        del nouveau
+        gc.collect()
+        rss_apres = memoire_rss()
+
+        RECHARGEMENTS.inc(1, "ok")
+        rapport.update(statut="ok", mots=mots, duree_s=round(duree, 3), duree_installation_s=round(duree_installation, 3))
+        if rss_avant is not None:
+            rapport["memoire"] = {
+                "rss_avant_octets": rss_avant,
+                "rss_pendant_octets": rss_pendant,
+                "rss_apres_octets": rss_apres,
+                "chevauchement_octets": rss_pendant - rss_avant,
+            }
+        self.dernier = rapport
+        print(f"✅ Dictionnaire rechargé ({raison}) : {mots} mots en {duree:.1f}s")
+
+    def surveiller(self):
+        """Recharger dès qu'un des fichiers change (watchfiles, sinon relevé toutes les `intervalle` s)"""
+        boucle = self.boucle_watchfiles if watchfiles is not None else self.boucle_releve
+        self.surveillance = threading.Thread(target=boucle, daemon=True)
+        self.surveillance.start()
+
+    def boucle_watchfiles(self):
+        cibles = set(self.chemins)
+        dossiers = sorted({os.path.dirname(c) for c in cibles if os.path.isdir(os.path.dirname(c))})
+        # Les fichiers écrits à côté puis renommés (.tmp) ne déclenchent rien avant le renommage
+        for changements in watchfiles.watch(*dossiers, stop_event=self.arret,
+                                            watch_filter=lambda _, chemin: chemin in cibles):
+            noms = sorted({os.path.basename(chemin) for _, chemin in changements})
+            self.demander(f"fichier modifié : {', '.join(noms)}")
+
+    def boucle_releve(self):
+        vue = stable = empreinte_fichiers(self.chemins)
+        while not self.arret.wait(self.intervalle):
+            courante = empreinte_fichiers(self.chemins)
+            if courante != vue:
+                # Écriture peut-être en cours : on attend un relevé identique
+                vue = courante
+            elif courante != stable:
+                stable = courante
+                self.demander("fichier modifié")
+
+    def arreter(self):
+        self.arret.set()
+        if self.surveillance is not None:
+            self.surveillance.join(timeout=5)
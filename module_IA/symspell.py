@@ -0,0 +1,112 @@
+import sys
+import time
+
+from module_IA import levenshtein, metriques
+
+
+def variantes_suppression(mot, max_dist):
+    """Toutes les chaînes obtenues en supprimant jusqu'à max_dist caractères (mot compris)"""
+    variantes = {mot}
+    courantes = {mot}
+    for _ in range(max_dist):
+        suivantes = set()
+        for v in courantes:
+            for i in range(len(v)):
+                suivantes.add(v[:i] + v[i + 1:])
+        suivantes -= variantes
+        variantes |= suivantes
+        courantes = suivantes
+    return variantes
+
+
+class SymSpell:
+    """
+    Moteur de correction par voisinage de suppressions (méthode SymSpell).
+    Chaque mot du dictionnaire est indexé sous toutes ses variantes obtenues par
+    suppression de 1 à max_dist caractères (sur les prefix_length premiers caractères).
+    Une recherche se limite alors à quelques accès au dictionnaire Python et à la
+    vérification d'un petit ensemble de candidats.
+    """
+
+    def __init__(self, mots, max_dist=2, prefix_length=7, repli=None):
+        self.mots = mots
+        self.max_dist = max_dist
+        self.prefix_length = prefix_length
+        # Moteur utilisé quand aucun mot n'est à distance <= max_dist (ex. Levenshtein)
+        self.repli = repli
+        self.suppressions = {}
+
+        debut = time.perf_counter()
+        for index, mot in enumerate(mots):
+            for variante in variantes_suppression(mot[:prefix_length], max_dist):
+                self.suppressions.setdefault(variante, []).append(index)
+        self.temps_construction = time.perf_counter() - debut
+
+    def candidats(self, word):
+        """Index des mots partageant une variante de suppression avec word"""
+        trouves = set()
+        for variante in variantes_suppression(word[:self.prefix_length], self.max_dist):
+            indices = self.suppressions.get(variante)
+            if indices:
+                trouves.update(indices)
+        return trouves
+
+    def within(self, word, max_dist=None):
+        """Mots à distance <= max_dist, triés par distance puis ordre du dictionnaire"""
+        if max_dist is None:
+            max_dist = self.max_dist
+        elif max_dist > self.max_dist:
+            # L'index ne couvre pas ce rayon : on délègue au moteur de repli
+            if self.repli is None:
+                raise ValueError(f"max_dist > {self.max_dist} non supporté sans moteur de repli")
+            return self.repli.within(word, max_dist)
+        resultats = []
+        evaluations = 0
+        for index in self.candidats(word):
+            mot = self.mots[index]
+            if abs(len(mot) - len(word)) > max_dist:
+                continue
+            d = levenshtein.distance(word, mot, max_dist)
+            evaluations += 1
+            if d <= max_dist:
+                resultats.append((d, index, mot))
+
+        metriques.compter_evaluations(evaluations)
+        resultats.sort()
+        return [(mot, d) for d, _, mot in resultats]
+
+    def top_k(self, word, k, max_dist=None):
+        """Les k meilleurs mots ; le repli n'est utilisé que si l'index n'en trouve pas assez"""
+        if max_dist is not None and max_dist <= self.max_dist:
+            return self.within(word, max_dist)[:k]
+        resultats = self.within(word, self.max_dist)
+        # Tout mot hors de l'index est à distance > self.max_dist : ces k-là sont les meilleurs
+        if len(resultats) >= k or self.repli is None:
+            return resultats[:k]
+        return self.repli.top_k(word, k, max_dist)
+
+    def mot_proche(self, word):
+        """Même interface que Levenshtein.mot_proche"""
+        resultats = self.within(word)
+        if resultats:
+            return resultats[0]
+        if self.repli is not None:
+            return self.repli.mot_proche(word)
+        return None, float("inf")
+
+    def memoire(self):
+        """Taille approximative de l'index en octets (table, clés et listes d'index)"""
+        total = sys.getsizeof(self.suppressions)
+        for variante, indices in self.suppressions.items():
+            total += sys.getsizeof(variante) + sys.getsizeof(indices)
+        # Les petits entiers (< 2**30) stockés dans les listes sont comptés une fois par mot
+        total += sum(sys.getsizeof(i) for i in range(len(self.mots)))
+        return total
+
+    def statistiques(self):
+        return {
+            "mots": len(self.mots),
+            "variantes": len(self.suppressions),
+            "memoire_octets": self.memoire(),
+            "temps_construction_s": round(self.temps_construction, 3),
+        }
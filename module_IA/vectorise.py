@@ -0,0 +1,136 @@
+import heapq
+
+from module_IA import metriques
+
+try:
+    import numpy as np
+except ImportError:  # numpy est optionnel : seul ce moteur en dépend
+    np = None
+
+
+class LevenshteinNumpy:
+    """
+    Moteur de mot proche vectorisé avec NumPy.
+    Les mots sont regroupés par longueur dans des tableaux d'entiers (points de code),
+    et la programmation dynamique avance ligne par ligne pour tout un groupe à la fois.
+    Les résultats (mot, distance, départage par ordre du dictionnaire) sont ceux de
+    Levenshtein.mot_proche.
+    """
+
+    def __init__(self, mots):
+        if np is None:
+            raise ImportError("Le moteur 'numpy' nécessite le paquet numpy (pip install numpy)")
+        self.mots = mots
+
+        # longueur -> (codes (N, L), index dans le dictionnaire (N,))
+        groupes = {}
+        for index, mot in enumerate(mots):
+            groupes.setdefault(len(mot), []).append(index)
+        self.groupes = {}
+        for longueur, indices in groupes.items():
+            codes = np.array([[ord(c) for c in mots[i]] for i in indices], dtype=np.int32)
+            self.groupes[longueur] = (codes.reshape(len(indices), longueur), np.array(indices, dtype=np.int64))
+
+    def distances_groupe(self, requete, codes, borne=None):
+        """
+        Distances entre la requête (tableau de points de code) et chaque ligne de codes.
+        Renvoie (distances, positions des lignes conservées) ; avec une borne, les lignes
+        dont toute la ligne DP dépasse la borne sont abandonnées en cours de route.
+        """
+        nb, longueur = codes.shape
+        colonnes = np.arange(longueur + 1, dtype=np.int32)
+        prec = np.broadcast_to(colonnes, (nb, longueur + 1))
+        actives = np.arange(nb)
+
+        for i, c in enumerate(requete, 1):
+            cout = (codes != c).astype(np.int32)
+            # Substitution et suppression, puis insertion par minimum cumulé :
+            # cour[j] = min_k<=j (x[k] + j - k) = j + min_k<=j (x[k] - k)
+            x = np.empty((len(actives), longueur + 1), dtype=np.int32)
+            x[:, 0] = i
+            np.minimum(prec[:, :-1] + cout, prec[:, 1:] + 1, out=x[:, 1:])
+            cour = np.minimum.accumulate(x - colonnes, axis=1) + colonnes
+
+            if borne is not None:
+                garde = cour.min(axis=1) <= borne
+                if not garde.all():
+                    cour, codes, actives = cour[garde], codes[garde], actives[garde]
+                    if len(actives) == 0:
+                        return cour[:, -1], actives
+            prec = cour
+
+        return prec[:, -1], actives
+
+    def mot_proche(self, word):
+        best_word = None
+        best_dist = float("inf")
+        best_index = None
+
+        requete = np.array([ord(c) for c in word], dtype=np.int32)
+        n = len(word)
+        evaluations = 0
+        # Les groupes de longueur proche d'abord : la borne se resserre plus vite
+        for longueur in sorted(self.groupes, key=lambda l: abs(l - n)):
+            if abs(longueur - n) > best_dist:
+                break
+            codes, indices = self.groupes[longueur]
+            # Une évaluation par mot du groupe (même si la ligne est abandonnée en route)
+            evaluations += len(indices)
+            # A distance égale l'ordre du dictionnaire départage : on garde les ex aequo
+            borne = None if best_word is None else best_dist
+            distances, actives = self.distances_groupe(requete, codes, borne)
+            if len(actives) == 0:
+                continue
+
+            d = int(distances.min())
+            if d > best_dist:
+                continue
+            index = int(indices[actives[distances == d]].min())
+            if d < best_dist or index < best_index:
+                best_dist, best_index, best_word = d, index, self.mots[index]
+
+        metriques.compter_evaluations(evaluations)
+        return best_word, best_dist
+
+    def top_k(self, word, k, max_dist=None):
+        """Les k meilleurs mots (distance, puis ordre du dictionnaire) en un seul passage"""
+        tas = []  # (-distance, -index, mot) : le pire candidat au sommet
+        requete = np.array([ord(c) for c in word], dtype=np.int32)
+        n = len(word)
+        for longueur in sorted(self.groupes, key=lambda l: abs(l - n)):
+            borne = max_dist
+            if len(tas) == k:
+                borne = -tas[0][0] if borne is None else min(borne, -tas[0][0])
+            if borne is not None and abs(longueur - n) > borne:
+                break
+            codes, indices = self.groupes[longueur]
+            distances, actives = self.distances_groupe(requete, codes, borne)
+            if borne is not None:
+                garde = distances <= borne
+                distances, actives = distances[garde], actives[garde]
+            # Dans un groupe, seuls les k meilleurs peuvent entrer dans le tas
+            if len(actives) > k:
+                ordre = np.lexsort((indices[actives], distances))[:k]
+                distances, actives = distances[ordre], actives[ordre]
+            for d, index in zip(distances.tolist(), indices[actives].tolist()):
+                if len(tas) < k:
+                    heapq.heappush(tas, (-d, -index, self.mots[index]))
+                elif (-d, -index) > tas[0][:2]:
+                    heapq.heapreplace(tas, (-d, -index, self.mots[index]))
+
+        return [(mot, -d) for d, _, mot in sorted(tas, reverse=True)]
+
+    def within(self, word, max_dist):
+        resultats = []
+        requete = np.array([ord(c) for c in word], dtype=np.int32)
+        n = len(word)
+        for longueur, (codes, indices) in self.groupes.items():
+            if abs(longueur - n) > max_dist:
+                continue
+            distances, actives = self.distances_groupe(requete, codes, max_dist)
+            garde = distances <= max_dist
+            for d, index in zip(distances[garde].tolist(), indices[actives[garde]].tolist()):
+                resultats.append((d, index, self.mots[index]))
+
+        resultats.sort()
+        return [(mot, d) for d, _, mot in resultats]
@@ -1,7 +1,21 @@
 import re
+import os
 import sys
+import json
 import argparse
-from typing import List, Set
+import multiprocessing
+from collections import deque
+from typing import Iterator, List, NamedTuple, Tuple
+
+
+class Violation(NamedTuple):
+    """Règle enfreinte, mot concerné et position (début, fin) du passage fautif dans le texte"""
+    rule: str
+    word: str
+    start: int
+    end: int
+    detail: str
+
 
 class MalagasySpellChecker:
     """
@@ -31,67 +45,84 @@ class MalagasySpellChecker:
         'ty', 'dy', 'fy', 'my', 'ky', 'gy', 'py', 'by', 'ny', 'ry', 'sy', 'hy', 'ly', 'vy', 'jy'
     }
 
-    # Regex pour géminées
-    RE_GEMINATED = re.compile(r'([bcdfghjklmnpqrstvwxyz])\1', re.IGNORECASE)
-
-    # Regex pour 'y' au milieu d'un mot
-    RE_Y_MIDDLE = re.compile(r'\w*y\w', re.IGNORECASE)
-
-    # Regex pour 3 consonnes consécutives
-    RE_THREE_CONSONANTS = re.compile(r'[^aeiouAEIOU]{3}', re.IGNORECASE)
+    # Consonnes (au sens des règles de combinaisons : 'y' final compris)
+    CONSONANTS = frozenset('bcdfghjklmnpqrstvwxyz')
+
+    # Clusters de 3 consonnes autorisés
+    ALLOWED_TRIPLES = frozenset(c for c in ALLOWED_CLUSTERS if len(c) == 3)
+
+    # Tokenisation unique du texte
+    RE_WORD = re.compile(r'\b\w+\b')
+
+    # Messages de synthèse par règle (dans l'ordre d'affichage)
+    RULE_MESSAGES = {
+        'forbidden_letter': "Mots contenant lettres interdites (c, q, u, w, x) : {words} "
+                            "(remplacez : ex. 'computer' → 'kômpiotera', 'quick' → 'kika').",
+        'geminated': "Géminées détectées (ex. kk, pp, tt) : rares en malgache.",
+        'three_consonants': "Trois consonnes consécutives : interdit en malgache.",
+        'y_middle': "Le 'y' ne doit apparaître qu'en fin de mot (ex. fady, maty, teny).",
+        'ends_with_i': "Mots finissant par 'i' (interdit) : {words} "
+                       "(utilisez 'y' : ex. maty au lieu de mati).",
+        'forbidden_pair': "Combinaisons interdites internes : {pairs} "
+                          "(autorisé : mp, mb, nt, nd, nk, ng, tr, dr, ts, dz, ty, dy, etc.).",
+    }
 
-    def __init__(self):
-        self.allowed_pattern = r'(?:' + '|'.join(re.escape(c) for c in self.ALLOWED_CLUSTERS) + r')'
-        self.re_allowed = re.compile(self.allowed_pattern, re.IGNORECASE)
+    def check_word(self, word: str, start: int = 0) -> List[Violation]:
+        """Toutes les règles en un seul passage sur les lettres du mot"""
+        violations = []
+        lower = word.lower()
+        if len(lower) != len(word):
+            # Certaines lettres changent de longueur en minuscule ("İ" -> "i̇") : une lettre par
+            # position, pour que les positions restent celles du texte d'origine
+            lower = ''.join(l if len(l) == 1 else c for c, l in ((c, c.lower()) for c in word))
+        n = len(lower)
+        consonants = self.CONSONANTS
+        allowed = self.ALLOWED_CLUSTERS
+
+        forbidden = [i for i, c in enumerate(word) if c in self.FORBIDDEN_LETTERS]
+        if forbidden:
+            violations.append(Violation('forbidden_letter', word, start, start + n, word[forbidden[0]]))
+
+        for i, c in enumerate(lower):
+            if c == 'y' and i < n - 1:
+                violations.append(Violation('y_middle', word, start + i, start + i + 1, 'y'))
+            if i + 1 < n and c in consonants and lower[i + 1] in consonants:
+                pair = lower[i:i + 2]
+                if c == lower[i + 1]:
+                    violations.append(Violation('geminated', word, start + i, start + i + 2, pair))
+                # Une paire est permise devant le 'y' final (ex. -tsy, -ndry)
+                final_y = i + 2 == n - 1 and lower[n - 1] == 'y'
+                if pair not in allowed and not final_y:
+                    violations.append(Violation('forbidden_pair', word, start + i, start + i + 2, pair))
+                if i + 2 < n and lower[i + 2] in consonants:
+                    triple = lower[i:i + 3]
+                    if triple not in self.ALLOWED_TRIPLES and not (i + 2 == n - 1 and lower[i + 2] == 'y'):
+                        violations.append(Violation('three_consonants', word, start + i, start + i + 3, triple))
+
+        if lower.endswith('i'):
+            violations.append(Violation('ends_with_i', word, start + n - 1, start + n, 'i'))
+        return violations
+
+    def find_violations(self, text: str) -> List[Violation]:
+        """Violations de toutes les règles, mot par mot, avec leurs positions dans le texte"""
+        violations = []
+        for m in self.RE_WORD.finditer(text):
+            violations.extend(self.check_word(m.group(), m.start()))
+        return violations
 
     def check_text(self, text: str) -> List[str]:
-        errors = []
+        """Synthèse des violations, un message par règle enfreinte"""
+        by_rule = {}
+        for v in self.find_violations(text):
+            by_rule.setdefault(v.rule, []).append(v)
 
-        # 1. Lettres interdites (renforcé : mot par mot)
-        words = re.findall(r'\b\w+\b', text)
-        forbidden_words = []
-        for word in words:
-            if any(letter in self.FORBIDDEN_LETTERS for letter in word):
-                forbidden_words.append(word)
-        if forbidden_words:
-            errors.append(f"Mots contenant lettres interdites (c, q, u, w, x) : {', '.join(set(forbidden_words))} "
-                          f"(remplacez : ex. 'computer' → 'kômpiotera', 'quick' → 'kika').")
-
-        # 2. Géminées (kk, pp, tt...)
-        if self.RE_GEMINATED.search(text):
-            errors.append("Géminées détectées (ex. kk, pp, tt) : rares en malgache.")
-
-        # 3. 3 consonnes consécutives
-        if self.RE_THREE_CONSONANTS.search(text):
-            errors.append("Trois consonnes consécutives : interdit en malgache.")
-
-        # 4. 'y' au milieu d'un mot
-        if self.RE_Y_MIDDLE.search(text):
-            errors.append("Le 'y' ne doit apparaître qu'en fin de mot (ex. fady, maty, teny).")
-
-        # 5. Mots finissant par 'i' (interdit : doit être 'y')
-        forbidden_end_i = [word for word in words if word.lower().endswith('i')]
-        if forbidden_end_i:
-            errors.append(f"Mots finissant par 'i' (interdit) : {', '.join(set(forbidden_end_i))} "
-                          f"(utilisez 'y' : ex. maty au lieu de mati).")
-
-        # 6. Clusters interdits (paires de consonnes internes)
-        cleaned = re.sub(r'\s+', '', text.lower())
-        consonant_pairs = re.findall(r'([bcdfghjklmnpqrstvwxyz][bcdfghjklmnpqrstvwxyz])', cleaned)
-
-        forbidden_pairs = []
-        for pair in consonant_pairs:
-            if pair.lower() in self.ALLOWED_CLUSTERS:
-                continue
-            if re.search(rf'{pair}y$', cleaned):
+        errors = []
+        for rule, message in self.RULE_MESSAGES.items():
+            if rule not in by_rule:
                 continue
-            forbidden_pairs.append(pair)
-
-        if forbidden_pairs:
-            unique = set(forbidden_pairs)
-            errors.append(f"Combinaisons interdites internes : {', '.join(unique)} "
-                          f"(autorisé : mp, mb, nt, nd, nk, ng, tr, dr, ts, dz, ty, dy, etc.).")
-
+            words = ', '.join(dict.fromkeys(v.word for v in by_rule[rule]))
+            pairs = ', '.join(dict.fromkeys(v.detail for v in by_rule[rule]))
+            errors.append(message.format(words=words, pairs=pairs))
         return errors
 
     def validate(self, text: str) -> str:
@@ -100,22 +131,103 @@ class MalagasySpellChecker:
             return "Erreurs détectées :\n" + "\n".join(f"- {err}" for err in errors)
         return "Texte correct selon les règles orthographiques du malgache !"
 
+def iter_files(paths: List[str], extension: str = '.txt') -> Iterator[str]:
+    """Fichiers à vérifier : les fichiers donnés, et ceux des dossiers (récursivement) ayant l'extension"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(extension):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def iter_chunks(paths: List[str], chunk_lines: int = 2000) -> Iterator[Tuple[str, int, List[str]]]:
+    """Blocs de lignes (fichier, numéro de la première ligne, lignes) lus en flux"""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = []
+            first = 1
+            for number, line in enumerate(f, 1):
+                lines.append(line.rstrip('\n'))
+                if len(lines) >= chunk_lines:
+                    yield path, first, lines
+                    lines = []
+                    first = number + 1
+            if lines:
+                yield path, first, lines
+
+
+_CHECKER = MalagasySpellChecker()
+
+
+def check_chunk(chunk: Tuple[str, int, List[str]]) -> List[str]:
+    """Violations d'un bloc en JSON Lines (ligne et colonne comptées à partir de 1)"""
+    path, first, lines = chunk
+    out = []
+    for number, line in enumerate(lines, first):
+        for v in _CHECKER.find_violations(line):
+            out.append(json.dumps({
+                'file': path, 'line': number, 'column': v.start + 1,
+                'rule': v.rule, 'word': v.word, 'detail': v.detail,
+            }, ensure_ascii=False))
+    return out
+
+
+def check_files(paths: List[str], jobs: int = 0, chunk_lines: int = 2000) -> Iterator[str]:
+    """
+    Vérifier des fichiers en flux sur un pool de processus, dans l'ordre des fichiers.
+    Au plus quelques blocs par processus sont en attente : la mémoire reste bornée
+    quelle que soit la taille du corpus.
+    """
+    chunks = iter_chunks(iter_files(paths), chunk_lines)
+    if jobs == 1:
+        for chunk in chunks:
+            yield from check_chunk(chunk)
+        return
+
+    jobs = jobs or os.cpu_count() or 1
+    with multiprocessing.Pool(jobs) as pool:
+        window = 4 * jobs
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(check_chunk, (chunk,)))
+            if len(pending) >= window:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Vérificateur orthographique malgache (règles complètes).")
     parser.add_argument("text", nargs="*", help="Texte à vérifier")
-    parser.add_argument("-f", "--file", help="Fichier texte à vérifier")
+    parser.add_argument("-f", "--file", nargs="+",
+                        help="Fichiers ou dossiers à vérifier en flux (violations en JSON Lines)")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="Nombre de processus (0 : un par cœur)")
+    parser.add_argument("--chunk-lines", type=int, default=2000, help="Lignes par bloc envoyé aux processus")
+    parser.add_argument("--ext", default=".txt", help="Extension des fichiers pris dans les dossiers")
     args = parser.parse_args()
 
     checker = MalagasySpellChecker()
 
     if args.file:
+        paths = list(iter_files(args.file, args.ext))
+        count = 0
         try:
-            with open(args.file, 'r', encoding='utf-8') as f:
-                text = f.read()
-            print(f"Vérification du fichier : {args.file}")
-            print(checker.validate(text))
-        except Exception as e:
-            print(f"Erreur de lecture : {e}")
+            for line in check_files(paths, args.jobs, args.chunk_lines):
+                print(line)
+                count += 1
+        except BrokenPipeError:
+            # Sortie fermée par le lecteur (ex. | head)
+            sys.stderr.close()
+            return
+        except OSError as e:
+            print(f"Erreur de lecture : {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"{count} violations dans {len(paths)} fichier(s)", file=sys.stderr)
     elif args.text:
         text = ' '.join(args.text)
         print(checker.validate(text))
@@ -0,0 +1,6 @@
+import os
+import sys
+
+RACINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.join(RACINE, "Scraping"))
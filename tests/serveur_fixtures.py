@@ -0,0 +1,149 @@
+"""
+Serveur local de pages de test pour le crawler : index alphabétique de Wikipedia
+(Manokana:Pejy_rehetra) et plages de mots de tenymalagasy, avec une latence
+réglable, des réponses d'erreur (avec Retry-After) et un journal des requêtes.
+
+    python tests/serveur_fixtures.py --port 8765
+    python Scraping/scraping.py --async --wikipedia-url http://127.0.0.1:8765 \
+        --tenymalagasy-url http://127.0.0.1:8765/bins/alphaLists
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def page_allpages(lettre, nombre):
+    liens = "".join(f'<li><a href="/wiki/{lettre}{i}">{lettre}mot{i}</a></li>' for i in range(nombre))
+    return f'<html><body><div class="mw-allpages-body"><ul>{liens}</ul></div></body></html>'
+
+
+def page_plages(plages):
+    liens = "".join(f'<a href="?range={plage}&lang=mg">{plage}</a> ' for plage in plages)
+    return f"<html><body>{liens}</body></html>"
+
+
+def page_plage(plage, nombre):
+    lignes = "".join(f'<tr><td><a href="#">{plage}teny{i}</a></td></tr>' for i in range(nombre))
+    return f"<html><body><table>{lignes}</table></body></html>"
+
+
+class ServeurFixtures:
+    """
+    Serveur HTTP dans un thread (par défaut sur un port libre choisi par le système).
+    - latence : attente (s) avant chaque réponse, pour avoir des requêtes simultanées
+    - echecs : {chemin avec requête: nombre de réponses `statut_echec` avant la bonne}
+    - journal : [(instant, chemin)] de toutes les requêtes reçues
+    - pic : plus grand nombre de requêtes traitées en même temps
+    """
+
+    def __init__(self, plages=("a", "b", "d"), mots_par_page=5, latence=0.0, echecs=None,
+                 statut_echec=503, retry_after=None, port=0):
+        self.plages = list(plages)
+        self.mots_par_page = mots_par_page
+        self.latence = latence
+        self.echecs = dict(echecs or {})
+        self.statut_echec = statut_echec
+        self.retry_after = retry_after
+        self.journal = []
+        self.en_vol = 0
+        self.pic = 0
+        self.verrou = threading.Lock()
+        self.serveur = ThreadingHTTPServer(("127.0.0.1", port), self.gestionnaire())
+        self.serveur.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.serveur.server_address[1]}"
+
+    @property
+    def tenymalagasy_url(self):
+        return f"{self.url}/bins/alphaLists"
+
+    def gestionnaire(self):
+        fixtures = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fixtures.repondre(self)
+
+            def log_message(self, *args):
+                pass
+
+        return Gestionnaire
+
+    def contenu(self, chemin):
+        """Corps HTML d'une page, None si elle n'existe pas"""
+        url = urlsplit(chemin)
+        params = parse_qs(url.query)
+        if url.path == "/w/index.php" and "from" in params:
+            return page_allpages(params["from"][0], self.mots_par_page)
+        if url.path == "/bins/alphaLists":
+            if "range" in params:
+                return page_plage(params["range"][0], self.mots_par_page)
+            return page_plages(self.plages)
+        return None
+
+    def repondre(self, requete):
+        with self.verrou:
+            self.journal.append((time.monotonic(), requete.path))
+            self.en_vol += 1
+            self.pic = max(self.pic, self.en_vol)
+            echec = self.echecs.get(requete.path, 0) > 0
+            if echec:
+                self.echecs[requete.path] -= 1
+        try:
+            time.sleep(self.latence)
+            contenu = None if echec else self.contenu(requete.path)
+            if echec:
+                requete.send_response(self.statut_echec)
+                if self.retry_after is not None:
+                    requete.send_header("Retry-After", str(self.retry_after))
+                corps = b""
+            elif contenu is None:
+                requete.send_response(404)
+                corps = b""
+            else:
+                requete.send_response(200)
+                requete.send_header("Content-Type", "text/html; charset=utf-8")
+                corps = contenu.encode("utf-8")
+            requete.send_header("Content-Length", str(len(corps)))
+            requete.end_headers()
+            requete.wfile.write(corps)
+        finally:
+            with self.verrou:
+                self.en_vol -= 1
+
+    def requetes(self, chemin):
+        """Instants des requêtes reçues pour ce chemin"""
+        return [instant for instant, vu in self.journal if vu == chemin]
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serveur.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.serveur.shutdown()
+        self.serveur.server_close()
+        self.thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local de pages de test pour le crawler")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latence", type=float, default=0.05)
+    parser.add_argument("--plages", type=int, default=20, help="Nombre de plages tenymalagasy")
+    parser.add_argument("--mots", type=int, default=50, help="Mots par page")
+    args = parser.parse_args()
+
+    fixtures = ServeurFixtures(plages=[f"p{i}" for i in range(args.plages)], mots_par_page=args.mots,
+                               latence=args.latence, port=args.port)
+    print(f"Pages de test sur {fixtures.url} (tenymalagasy : {fixtures.tenymalagasy_url})")
+    fixtures.serveur.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from crawler import CrawlerAsync
+from scraping import ALPHABET, allpages_url
+from serveur_fixtures import ServeurFixtures
+
+
+def crawler(fixtures, **options):
+    options.setdefault("workers", 1)
+    return CrawlerAsync(fixtures.url, fixtures.tenymalagasy_url, **options)
+
+
+def test_crawl_complet():
+    with ServeurFixtures(plages=("a", "b"), mots_par_page=3) as fixtures:
+        wiki, teny = crawler(fixtures, debit=1000).executer()
+    assert [w["mot"] for w in wiki] == [f"{lettre}mot{i}" for lettre in ALPHABET for i in range(3)]
+    assert [w["mot"] for w in teny] == [f"{plage}teny{i}" for plage in "ab" for i in range(3)]
+
+
+def test_debit_par_hote():
+    # 19 pages Wikipedia + la page des plages + 3 plages, toutes sur le même hôte
+    with ServeurFixtures(plages=("a", "b", "d")) as fixtures:
+        crawler(fixtures, debit=10.0).executer()
+    instants = sorted(instant for instant, _ in fixtures.journal)
+    assert len(instants) == len(ALPHABET) + 4
+    # Seau de 10 jetons au départ, puis 10 requêtes par seconde
+    assert instants[-1] - instants[0] >= (len(instants) - 10) / 10.0 * 0.9
+
+
+def test_reessai_avec_retry_after():
+    chemin = allpages_url("", "B")
+    with ServeurFixtures(echecs={chemin: 2}, retry_after=1) as fixtures:
+        robot = crawler(fixtures, debit=1000, attente=0.01)
+        wiki, _ = robot.executer()
+    instants = fixtures.requetes(chemin)
+    assert len(instants) == 3
+    # Le délai du serveur l'emporte sur l'attente exponentielle (10 ms, 20 ms)
+    assert all(b - a >= 0.95 for a, b in zip(instants, instants[1:]))
+    assert robot.statistiques["reessais"] == 2
+    assert robot.statistiques["echecs"] == 0
+    assert "Bmot0" in [w["mot"] for w in wiki]
+
+
+def test_echec_apres_toutes_les_tentatives():
+    chemin = allpages_url("", "D")
+    with ServeurFixtures(echecs={chemin: 10}) as fixtures:
+        robot = crawler(fixtures, debit=1000, attente=0.01, tentatives=3)
+        wiki, _ = robot.executer()
+    assert len(fixtures.requetes(chemin)) == 3
+    assert robot.statistiques["echecs"] == 1
+    assert not any(w["mot"].startswith("D") for w in wiki)
+
+
+def test_concurrence_plafonnee():
+    with ServeurFixtures(plages=[f"p{i}" for i in range(10)], latence=0.1) as fixtures:
+        crawler(fixtures, debit=1000, concurrence=3).executer()
+    assert fixtures.pic == 3
+
+
+def test_flux_dans_l_ordre():
+    with ServeurFixtures(plages=("a", "b"), mots_par_page=2, echecs={allpages_url("", "A"): 1},
+                         retry_after=1) as fixtures:
+        mots = [w["mot"] for w in crawler(fixtures, debit=1000).iter_words(taille_file=4)]
+    assert mots == [f"{lettre}mot{i}" for lettre in ALPHABET for i in range(2)] + \
+        [f"{plage}teny{i}" for plage in "ab" for i in range(2)]
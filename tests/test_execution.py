@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+from module_IA.dictionnaire import Dictionnaire
+from module_IA.execution import PoolCorrection
+
+
+def dictionnaire(tmp_path):
+    path = tmp_path / "teny.txt"
+    path.write_text("teny\nvola\nfitiavana\nAC Milan\n", encoding="utf-8")
+    return Dictionnaire.charger(str(path), moteur="levenshtein", taille_cache=0)
+
+
+def test_pool_mot_proche(tmp_path):
+    pool = PoolCorrection(dictionnaire(tmp_path), 1)
+    try:
+        assert asyncio.run(pool.mot_proche("volaa")) == ("vola", 1)
+        assert asyncio.run(pool.mot_proche_lot(["tenny", "fitiavna"])) == {
+            "tenny": ("teny", 1), "fitiavna": ("fitiavana", 1),
+        }
+    finally:
+        pool.fermer()
+
+
+def test_fermeture_apres_liberation(tmp_path):
+    pool = PoolCorrection(dictionnaire(tmp_path), 1)
+    assert pool.acquerir()
+    fermeture = threading.Thread(target=pool.fermer, kwargs={"attendre": True})
+    fermeture.start()
+    # La requête qui a acquis le pool peut encore calculer ; les nouvelles sont refusées
+    fermeture.join(0.2)
+    assert fermeture.is_alive()
+    assert not pool.acquerir()
+    assert asyncio.run(pool.mot_proche("teni")) == ("teny", 1)
+    pool.liberer()
+    fermeture.join(10)
+    assert not fermeture.is_alive()
@@ -0,0 +1,114 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from module_IA.dictionnaire import Dictionnaire
+from module_IA.incremental import ParagrapheInconnu, VerificateurIncremental, hash_paragraphe
+from module_IA.verificationmot import MalagasySpellChecker
+
+RE_MOT = re.compile(r"\b[a-zA-Zà-ÿÀ-Ÿ-]+\b")
+
+
+@pytest.fixture(scope="module")
+def dictionnaire(tmp_path_factory):
+    path = tmp_path_factory.mktemp("dico") / "teny.txt"
+    path.write_text("teny\nvola\nfitiavana\nAC Milan\n", encoding="utf-8")
+    return Dictionnaire.charger(str(path), moteur="levenshtein", taille_cache=0)
+
+
+def verificateur():
+    return VerificateurIncremental(RE_MOT, regles=MalagasySpellChecker())
+
+
+def positions(reponse):
+    return [(t["word"], t["start"], t["end"]) for t in reponse["tokens"]]
+
+
+def test_reutilisation_par_hash(dictionnaire):
+    v = verificateur()
+    paragraphes = ["teny tenyy", "vola", "AC Milan volaa"]
+    premier = v.verifier(dictionnaire, [(p, None) for p in paragraphes], "s")
+    assert premier["rechecked"] == 3
+    assert premier["paragraphs"] == [hash_paragraphe(p) for p in paragraphes]
+    assert positions(premier) == [("tenyy", 5, 10), ("volaa", 25, 30)]
+
+    # Même texte : tout vient du cache de la session
+    second = v.verifier(dictionnaire, [(p, None) for p in paragraphes], "s")
+    assert second["rechecked"] == 0
+    assert positions(second) == positions(premier)
+
+    # Sans session, rien n'est mémorisé
+    assert v.verifier(dictionnaire, [(p, None) for p in paragraphes])["rechecked"] == 3
+    assert v.verifier(dictionnaire, [(p, None) for p in paragraphes])["rechecked"] == 3
+
+
+def test_decalage_apres_edition(dictionnaire):
+    v = verificateur()
+    v.verifier(dictionnaire, [("teny", None), ("vola tenyy", None), ("fitiavna", None)], "s")
+    # Le premier paragraphe s'allonge de 6 caractères : les suivants sont repris du
+    # cache mais leurs positions sont décalées d'autant
+    reponse = v.verifier(dictionnaire, [("teny vola x", None), ("vola tenyy", None), ("fitiavna", None)], "s")
+    assert reponse["rechecked"] == 1
+    assert positions(reponse) == [("tenyy", 17, 22), ("fitiavna", 23, 31)]
+
+    # Paragraphe raccourci, puis supprimé
+    reponse = v.verifier(dictionnaire, [("", None), ("vola tenyy", None), ("fitiavna", None)], "s")
+    assert positions(reponse) == [("tenyy", 6, 11), ("fitiavna", 12, 20)]
+    reponse = v.verifier(dictionnaire, [("vola tenyy", None), ("fitiavna", None)], "s")
+    assert reponse["rechecked"] == 0
+    assert positions(reponse) == [("tenyy", 5, 10), ("fitiavna", 11, 19)]
+
+
+def test_requete_delta(dictionnaire):
+    v = verificateur()
+    paragraphes = ["vola tenyy", "fitiavna"]
+    empreintes = v.verifier(dictionnaire, [(p, None) for p in paragraphes], "s")["paragraphs"]
+    # Seul le paragraphe modifié est envoyé en entier, les autres par leur hash
+    reponse = v.verifier(dictionnaire, [("teny vola volaa", None), (None, empreintes[0]), (None, empreintes[1])], "s")
+    assert reponse["rechecked"] == 1
+    assert reponse["unknown"] == ["volaa", "tenyy", "fitiavna"]
+    assert positions(reponse) == [("volaa", 10, 15), ("tenyy", 21, 26), ("fitiavna", 27, 35)]
+    assert reponse["paragraphs"] == [hash_paragraphe("teny vola volaa")] + empreintes
+
+
+def test_regles_decalees(dictionnaire):
+    v = verificateur()
+    v.verifier(dictionnaire, [("teny", None), ("vola nb", None)], "s")
+    # Règles demandées après coup pour un paragraphe envoyé par son hash : inconnu pour les règles
+    with pytest.raises(ParagrapheInconnu):
+        v.verifier(dictionnaire, [("teny", None), (None, hash_paragraphe("vola nb"))], "s", regles=True)
+    reponse = v.verifier(dictionnaire, [("teny teny", None), ("vola nb", None)], "s", regles=True)
+    assert [(x["rule"], x["start"], x["end"]) for x in reponse["violations"]] == [("forbidden_pair", 15, 17)]
+    # Violations mémorisées : le hash suffit désormais
+    reponse = v.verifier(dictionnaire, [("teny", None), (None, hash_paragraphe("vola nb"))], "s", regles=True)
+    assert reponse["rechecked"] == 0
+    assert [(x["start"], x["end"]) for x in reponse["violations"]] == [(10, 12)]
+
+
+def test_hash_inconnu(dictionnaire):
+    v = verificateur()
+    v.verifier(dictionnaire, [("teny", None)], "s")
+    with pytest.raises(ParagrapheInconnu):
+        v.verifier(dictionnaire, [(None, hash_paragraphe("teny"))], "autre")
+    with pytest.raises(ParagrapheInconnu):
+        v.verifier(dictionnaire, [(None, hash_paragraphe("vola"))], "s")
+    # Un autre dictionnaire (rechargement) invalide la session
+    with pytest.raises(ParagrapheInconnu):
+        v.verifier(object(), [(None, hash_paragraphe("teny"))], "s")
+
+
+def test_api_hash_inconnu():
+    with TestClient(api.app) as client:
+        reponse = client.post("/check_spelling", json={"session_id": "s409", "paragraphs": [{"hash": "0" * 16}]})
+        assert reponse.status_code == 409
+        reponse = client.post("/check_spelling", json={"session_id": "s409", "paragraphs": [{}]})
+        assert reponse.status_code == 422
+
+        premier = client.post("/check_spelling", json={"session_id": "s409", "text": "teny\ntenyy"}).json()
+        reponse = client.post("/check_spelling", json={
+            "session_id": "s409", "paragraphs": [{"text": "vola teny"}, {"hash": premier["paragraphs"][1]}],
+        })
+        assert reponse.status_code == 200
+        assert reponse.json()["tokens"] == [{"word": "tenyy", "start": 10, "end": 15}]
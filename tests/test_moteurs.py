@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from module_IA.automate import MoteurAutomate
+from module_IA.bktree import ArbreBKPlat, BKTree
+from module_IA.levenshtein import Levenshtein
+from module_IA.symspell import SymSpell
+from module_IA.vectorise import LevenshteinNumpy
+
+# Petit alphabet : beaucoup de distances égales, donc de départages par la position
+ALPHABET = "aeiknrt"
+
+
+def mot_aleatoire(rng, longueur_max=8):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, longueur_max)))
+
+
+@pytest.fixture(scope="module")
+def mots():
+    rng = random.Random(20)
+    # Mots distincts dans un ordre quelconque (l'ordre des candidats départage les égalités)
+    return list(dict.fromkeys(mot_aleatoire(rng) for _ in range(600)))
+
+
+@pytest.fixture(scope="module")
+def requetes(mots):
+    rng = random.Random(21)
+    requetes = [mot_aleatoire(rng, 10) for _ in range(60)]
+    # Mots du dictionnaire (distance 0) et mots vides ou très éloignés (repli)
+    return requetes + rng.sample(mots, 10) + ["", "zzzzzzzzzzzz"]
+
+
+MOTEURS = {
+    "bktree": lambda mots, exact: BKTree(mots),
+    "bktree_plat": lambda mots, exact: ArbreBKPlat(BKTree(mots).aplatir()),
+    "symspell": lambda mots, exact: SymSpell(mots, repli=exact),
+    "numpy": lambda mots, exact: LevenshteinNumpy(mots),
+    "automate": lambda mots, exact: MoteurAutomate(mots, repli=exact),
+}
+
+
+@pytest.fixture(scope="module", params=sorted(MOTEURS))
+def moteur(request, mots):
+    return MOTEURS[request.param](mots, Levenshtein(mots=mots))
+
+
+def test_mot_proche(moteur, mots, requetes):
+    reference = Levenshtein(mots=mots)
+    for requete in requetes:
+        assert moteur.mot_proche(requete) == reference.mot_proche(requete), requete
+
+
+@pytest.mark.parametrize("max_dist", [0, 1, 2, 3])
+def test_within(moteur, mots, requetes, max_dist):
+    reference = Levenshtein(mots=mots)
+    for requete in requetes:
+        assert moteur.within(requete, max_dist) == reference.within(requete, max_dist), requete
+
+
+@pytest.mark.parametrize("k, max_dist", [(1, None), (5, None), (20, None), (5, 1), (10, 2), (3, 4)])
+def test_top_k(moteur, mots, requetes, k, max_dist):
+    reference = Levenshtein(mots=mots)
+    for requete in requetes:
+        assert moteur.top_k(requete, k, max_dist) == reference.top_k(requete, k, max_dist), requete
+
+
+def test_arbre_vide():
+    for arbre in (BKTree([]), ArbreBKPlat(BKTree([]).aplatir())):
+        assert arbre.mot_proche("teny") == (None, float("inf"))
+        assert arbre.within("teny", 2) == []
+        assert arbre.top_k("teny", 3) == []
@@ -0,0 +1,76 @@
+import threading
+
+from module_IA.rechargement import Rechargeur
+
+
+class Dico:
+    def __init__(self, numero):
+        self.numero = numero
+
+    def __len__(self):
+        return 1
+
+
+def test_rechargement():
+    installes = []
+    rechargeur = Rechargeur(lambda: Dico(len(installes)), installes.append)
+    assert rechargeur.demander()
+    assert rechargeur.termine.wait(5)
+    assert rechargeur.dernier["statut"] == "ok"
+    assert [d.numero for d in installes] == [0]
+    assert not rechargeur.en_cours
+
+
+def test_erreur_installation():
+    erreurs = [RuntimeError("pool de correction indisponible")]
+    installes = []
+
+    def installer(nouveau):
+        if erreurs:
+            raise erreurs.pop()
+        installes.append(nouveau)
+
+    rechargeur = Rechargeur(lambda: Dico(0), installer)
+    assert rechargeur.demander()
+    assert rechargeur.termine.wait(5)
+    assert rechargeur.dernier["statut"] == "erreur"
+    assert rechargeur.dernier["etape"] == "installation"
+    assert "pool de correction indisponible" in rechargeur.dernier["erreur"]
+    assert not rechargeur.en_cours
+
+    # Le rechargeur n'est pas bloqué : la demande suivante est lancée et aboutit
+    assert rechargeur.demander()
+    assert rechargeur.termine.wait(5)
+    assert rechargeur.dernier["statut"] == "ok"
+    assert len(installes) == 1
+
+
+def test_erreur_construction():
+    def construire():
+        raise FileNotFoundError("teny_clean.txt")
+
+    rechargeur = Rechargeur(construire, lambda nouveau: None)
+    assert rechargeur.demander()
+    assert rechargeur.termine.wait(5)
+    assert rechargeur.dernier["etape"] == "construction"
+    assert not rechargeur.en_cours
+
+
+def test_demande_pendant_un_rechargement():
+    debloquer = threading.Event()
+    constructions = []
+
+    def construire():
+        constructions.append(len(constructions))
+        debloquer.wait(5)
+        return Dico(len(constructions))
+
+    rechargeur = Rechargeur(construire, lambda nouveau: None)
+    assert rechargeur.demander("premier")
+    # Déjà en cours : refait à la fin, une seule fois pour plusieurs demandes
+    assert not rechargeur.demander("deuxieme")
+    assert not rechargeur.demander("troisieme")
+    debloquer.set()
+    assert rechargeur.termine.wait(5)
+    assert len(constructions) == 2
+    assert rechargeur.dernier["raison"] == "troisieme"
@@ -0,0 +1,62 @@
+import pytest
+
+from module_IA.verificationmot import MalagasySpellChecker, Violation
+
+CHECKER = MalagasySpellChecker()
+
+
+@pytest.mark.parametrize("mot, attendu", [
+    # Mots corrects, clusters et triples autorisés
+    ("faty", []),
+    ("tsotra", []),
+    ("mandry", []),
+    ("antsa", []),
+    ("ndrindra", []),
+    ("ntsy", []),
+    # Paire quelconque permise devant le 'y' final, interdite ailleurs
+    ("tafky", []),
+    ("tafka", [("forbidden_pair", 2, 4, "fk")]),
+    ("mati", [("ends_with_i", 3, 4, "i")]),
+    ("MATI", [("ends_with_i", 3, 4, "i")]),
+    ("computer", [("forbidden_letter", 0, 8, "c")]),
+    ("manonboka", [("forbidden_pair", 4, 6, "nb")]),
+    ("akka", [("geminated", 1, 3, "kk"), ("forbidden_pair", 1, 3, "kk")]),
+    ("ampla", [("three_consonants", 1, 4, "mpl"), ("forbidden_pair", 2, 4, "pl")]),
+    ("tenyy", [("y_middle", 3, 4, "y"), ("geminated", 3, 5, "yy"), ("forbidden_pair", 3, 5, "yy")]),
+    # "İ" devient deux caractères en minuscule : les positions restent celles du mot
+    ("İkkai", [("geminated", 1, 3, "kk"), ("forbidden_pair", 1, 3, "kk"), ("ends_with_i", 4, 5, "i")]),
+    ("İcu", [("forbidden_letter", 0, 3, "c")]),
+    ("Mİ", []),
+])
+def test_check_word(mot, attendu):
+    violations = CHECKER.check_word(mot)
+    assert [(v.rule, v.start, v.end, v.detail) for v in violations] == attendu
+    assert all(v.word == mot for v in violations)
+
+
+@pytest.mark.parametrize("mot, debut", [("mati", 0), ("mati", 12), ("İkkai", 7)])
+def test_check_word_decalage(mot, debut):
+    assert CHECKER.check_word(mot, debut) == [
+        v._replace(start=v.start + debut, end=v.end + debut) for v in CHECKER.check_word(mot)
+    ]
+
+
+@pytest.mark.parametrize("texte, attendu", [
+    ("", []),
+    ("teny tsara", []),
+    ("teny tsara, mati computer", [
+        Violation("ends_with_i", "mati", 15, 16, "i"),
+        Violation("forbidden_letter", "computer", 17, 25, "c"),
+    ]),
+    ("İkka mati", [
+        Violation("geminated", "İkka", 1, 3, "kk"),
+        Violation("forbidden_pair", "İkka", 1, 3, "kk"),
+        Violation("ends_with_i", "mati", 8, 9, "i"),
+    ]),
+])
+def test_find_violations(texte, attendu):
+    violations = CHECKER.find_violations(texte)
+    assert violations == attendu
+    # Les positions désignent bien le passage fautif dans le texte d'origine
+    for v in violations:
+        assert texte[v.start:v.end].lower() in (v.detail, v.word.lower())
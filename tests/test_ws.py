@@ -0,0 +1,46 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(api.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("message", [
+    "pas du json",
+    "[1, 2]",
+    '{"type": "inconnu"}',
+    '{"type": "edit", "version": null, "text": "teny"}',
+    '{"type": "edit", "version": "3", "text": "teny"}',
+    '{"type": "edit", "version": true, "text": "teny"}',
+    '{"type": "edit", "index": -1, "text": "teny"}',
+    '{"type": "edit", "index": 5, "text": "teny"}',
+    '{"type": "edit", "text": 3}',
+    '{"type": "suggest", "word": "tenyy", "k": "x"}',
+    '{"type": "suggest", "word": "tenyy", "k": 0}',
+    '{"type": "suggest", "word": "tenyy", "max_dist": -1}',
+])
+def test_message_invalide(client, message):
+    with client.websocket_connect("/ws/spell") as ws:
+        ws.send_text(message)
+        assert ws.receive_json()["type"] == "error"
+        # La connexion continue : une édition sans version reçoit ses marqueurs
+        ws.send_json({"type": "edit", "text": "tenyy"})
+        reponse = ws.receive_json()
+        assert reponse["type"] == "markers"
+        assert reponse["unknown"] == ["tenyy"]
+
+
+def test_versions(client):
+    with client.websocket_connect("/ws/spell") as ws:
+        ws.send_json({"type": "edit", "version": 7, "text": "teny"})
+        assert ws.receive_json()["version"] == 7
+        ws.send_json({"type": "edit", "version": None, "text": "teny"})
+        assert ws.receive_json()["type"] == "error"
+        # Sans version : la précédente + 1, la version null ayant été refusée
+        ws.send_json({"type": "edit", "text": "teny vola"})
+        assert ws.receive_json()["version"] == 8